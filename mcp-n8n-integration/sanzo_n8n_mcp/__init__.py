@@ -15,14 +15,50 @@ __version__ = "1.0.0"
 __author__ = "Claude Code"
 __email__ = "claude@anthropic.com"
 
-from .server import SanzoN8NMCPServer
-from .models import *
+from .models import (
+    WorkflowType,
+    WorkflowStatus,
+    TriggerType,
+    WorkflowConfiguration,
+    WorkflowInput,
+    WorkflowExecution,
+    WorkflowMetrics,
+    BatchWorkflowRequest,
+    BatchWorkflowResult,
+    WorkflowTriggerConfig,
+    SanzoAnalysisData,
+    WorkflowHealthCheck,
+    WorkflowAnalytics,
+    WebhookEvent
+)
 from .n8n_client import N8NClient
 from .workflow_manager import WorkflowManager
 
+
+def __getattr__(name):
+    """Import the MCP server lazily so client-only users skip fastmcp"""
+    if name == "SanzoN8NMCPServer":
+        from .server import SanzoN8NMCPServer
+        return SanzoN8NMCPServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "SanzoN8NMCPServer",
     "N8NClient",
     "WorkflowManager",
-    # Models will be imported via *
-]
\ No newline at end of file
+    "WorkflowType",
+    "WorkflowStatus",
+    "TriggerType",
+    "WorkflowConfiguration",
+    "WorkflowInput",
+    "WorkflowExecution",
+    "WorkflowMetrics",
+    "BatchWorkflowRequest",
+    "BatchWorkflowResult",
+    "WorkflowTriggerConfig",
+    "SanzoAnalysisData",
+    "WorkflowHealthCheck",
+    "WorkflowAnalytics",
+    "WebhookEvent"
+]
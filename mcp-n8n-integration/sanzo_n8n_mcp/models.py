@@ -2,10 +2,11 @@
 Pydantic models for Sanzo N8N MCP integration
 """
 
+import time
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, validator
 
 
 class WorkflowType(str, Enum):
@@ -35,7 +36,28 @@ class TriggerType(str, Enum):
     BATCH = "batch"
 
 
-class WorkflowConfiguration(BaseModel):
+# Plain string values per workflow type; a dict lookup is cheaper than the
+# Enum ``.value`` descriptor on hot paths
+WORKFLOW_TYPE_VALUES: Dict[WorkflowType, str] = {
+    workflow_type: workflow_type.value for workflow_type in WorkflowType
+}
+
+
+class SanzoBaseModel(BaseModel):
+    """Base model with shared configuration for all Sanzo DTOs"""
+    # These restate pydantic's defaults on purpose: subclasses must not opt in
+    # to per-instance overhead on the execution hot path
+    model_config = ConfigDict(
+        # n8n payloads carry extra keys; drop them rather than store them
+        extra="ignore",
+        # Status updates assign fields in place; skip revalidating each one
+        validate_assignment=False,
+        # Nested model instances are trusted as already validated
+        revalidate_instances="never"
+    )
+
+
+class WorkflowConfiguration(SanzoBaseModel):
     """N8N workflow configuration"""
     name: str = Field(..., description="Workflow name")
     workflow_type: WorkflowType = Field(..., description="Type of workflow")
@@ -47,7 +69,7 @@ class WorkflowConfiguration(BaseModel):
     enabled: bool = Field(default=True, description="Whether workflow is enabled")
 
 
-class WorkflowInput(BaseModel):
+class WorkflowInput(SanzoBaseModel):
     """Input data for workflow execution"""
     workflow_type: WorkflowType = Field(..., description="Type of workflow to execute")
     data: Dict[str, Any] = Field(..., description="Workflow input data")
@@ -57,7 +79,7 @@ class WorkflowInput(BaseModel):
     timeout_override: Optional[int] = Field(None, description="Override default timeout")
 
 
-class WorkflowExecution(BaseModel):
+class WorkflowExecution(SanzoBaseModel):
     """Workflow execution tracking"""
     execution_id: str = Field(..., description="Unique execution ID")
     workflow_type: WorkflowType = Field(..., description="Type of workflow")
@@ -72,8 +94,11 @@ class WorkflowExecution(BaseModel):
     correlation_id: Optional[str] = Field(None, description="Correlation ID for tracking")
     retry_count: int = Field(default=0, description="Number of retries performed")
 
+    # Monotonic clock reading at creation, for durations immune to clock changes
+    _started_monotonic: float = PrivateAttr(default_factory=time.monotonic)
+
 
-class WorkflowMetrics(BaseModel):
+class WorkflowMetrics(SanzoBaseModel):
     """Workflow execution metrics"""
     workflow_type: WorkflowType = Field(..., description="Type of workflow")
     total_executions: int = Field(default=0, description="Total number of executions")
@@ -84,7 +109,7 @@ class WorkflowMetrics(BaseModel):
     last_execution: Optional[datetime] = Field(None, description="Last execution timestamp")
 
 
-class BatchWorkflowRequest(BaseModel):
+class BatchWorkflowRequest(SanzoBaseModel):
     """Batch workflow execution request"""
     workflows: List[WorkflowType] = Field(..., description="List of workflows to execute")
     shared_data: Dict[str, Any] = Field(default_factory=dict, description="Shared data for all workflows")
@@ -97,7 +122,7 @@ class BatchWorkflowRequest(BaseModel):
     correlation_id: Optional[str] = Field(None, description="Batch correlation ID")
 
 
-class BatchWorkflowResult(BaseModel):
+class BatchWorkflowResult(SanzoBaseModel):
     """Batch workflow execution result"""
     batch_id: str = Field(..., description="Unique batch ID")
     total_workflows: int = Field(..., description="Total number of workflows in batch")
@@ -109,7 +134,7 @@ class BatchWorkflowResult(BaseModel):
     total_duration_seconds: Optional[float] = Field(None, description="Total batch duration")
 
 
-class WorkflowTriggerConfig(BaseModel):
+class WorkflowTriggerConfig(SanzoBaseModel):
     """Configuration for automated workflow triggers"""
     trigger_name: str = Field(..., description="Unique trigger name")
     workflow_type: WorkflowType = Field(..., description="Workflow to trigger")
@@ -120,7 +145,7 @@ class WorkflowTriggerConfig(BaseModel):
     data_template: Dict[str, Any] = Field(default_factory=dict, description="Default data template")
 
 
-class SanzoAnalysisData(BaseModel):
+class SanzoAnalysisData(SanzoBaseModel):
     """Sanzo Color Advisor analysis data structure"""
     analysis_type: str = Field(..., description="Type of analysis performed")
     room_type: str = Field(..., description="Room type analyzed")
@@ -132,7 +157,7 @@ class SanzoAnalysisData(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional analysis metadata")
 
 
-class WorkflowHealthCheck(BaseModel):
+class WorkflowHealthCheck(SanzoBaseModel):
     """Health check result for workflow system"""
     status: str = Field(..., description="Overall system status")
     n8n_connection: bool = Field(..., description="N8N connectivity status")
@@ -143,7 +168,7 @@ class WorkflowHealthCheck(BaseModel):
     service_endpoints: Dict[str, bool] = Field(..., description="Status of external service endpoints")
 
 
-class WorkflowAnalytics(BaseModel):
+class WorkflowAnalytics(SanzoBaseModel):
     """Analytics data for workflow performance"""
     time_period: str = Field(..., description="Time period for analytics")
     total_executions: int = Field(..., description="Total executions in period")
@@ -154,7 +179,7 @@ class WorkflowAnalytics(BaseModel):
     recommendations: List[str] = Field(..., description="Performance recommendations")
 
 
-class WebhookEvent(BaseModel):
+class WebhookEvent(SanzoBaseModel):
     """Webhook event data"""
     event_id: str = Field(..., description="Unique event ID")
     event_type: str = Field(..., description="Type of webhook event")
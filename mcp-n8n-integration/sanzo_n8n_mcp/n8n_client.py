@@ -3,13 +3,14 @@ N8N API Client for workflow management and execution
 """
 
 import asyncio
-import json
+import logging
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import httpx
+import orjson
 from pydantic import BaseModel
 
 from .models import (
@@ -17,9 +18,15 @@ from .models import (
     WorkflowExecution,
     WorkflowStatus,
     WorkflowType,
-    WorkflowHealthCheck
+    WorkflowHealthCheck,
+    WORKFLOW_TYPE_VALUES
 )
 
+if TYPE_CHECKING:
+    from .server import ServerConfig
+
+logger = logging.getLogger(__name__)
+
 
 class N8NAPIError(Exception):
     """N8N API specific errors"""
@@ -42,7 +49,8 @@ class N8NClient:
         webhook_base_url: str = "http://localhost:5678/webhook",
         webhook_server_url: str = "http://localhost:3003",
         api_key: Optional[str] = None,
-        timeout: int = 30
+        timeout: int = 30,
+        health_cache_ttl: float = 5.0
     ):
         self.n8n_base_url = n8n_base_url.rstrip('/')
         self.webhook_base_url = webhook_base_url.rstrip('/')
@@ -50,6 +58,11 @@ class N8NClient:
         self.api_key = api_key
         self.timeout = timeout
 
+        # Short-lived health check cache shared by concurrent callers
+        self.health_cache_ttl = health_cache_ttl
+        self._health_cache: Optional[Tuple[float, WorkflowHealthCheck]] = None
+        self._health_lock = asyncio.Lock()
+
         # HTTP client configuration
         headers = {
             "Content-Type": "application/json",
@@ -58,10 +71,19 @@ class N8NClient:
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
 
+        # HTTP/2 multiplexes concurrent batch triggers and health probes over
+        # a single connection per host when the server supports it. Idle
+        # connections are kept for 75s (nginx's default keepalive_timeout) so
+        # polling-style tool calls reuse them instead of re-handshaking.
         self.client = httpx.AsyncClient(
             timeout=timeout,
             headers=headers,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=75.0
+            )
         )
 
         # Workflow configurations
@@ -96,6 +118,32 @@ class N8NClient:
             )
         }
 
+        # Health probe URLs are fixed after init, parse them once
+        self._probe_urls = {
+            "n8n_api": httpx.URL(f"{self.n8n_base_url}/api/v1/workflows"),
+            "webhook_server": httpx.URL(f"{self.webhook_server_url}/api/health"),
+            "sanzo_api": httpx.URL("http://localhost:3000/api/health"),
+            "photo_analysis": httpx.URL("http://localhost:3002/api/health")
+        }
+        self._executions_url = httpx.URL(f"{self.n8n_base_url}/api/v1/executions")
+
+        # Webhook proxy endpoints are fixed after init, build them once
+        self._endpoint_by_type = {
+            workflow_type: f"{self.webhook_server_url}/api/webhooks/{workflow_type.value}"
+            for workflow_type in WorkflowType
+        }
+
+    @classmethod
+    def from_config(cls, config: "ServerConfig", **kwargs: Any) -> "N8NClient":
+        """Create a client from the server's connection settings"""
+        return cls(
+            n8n_base_url=config.n8n_base_url,
+            webhook_base_url=config.webhook_base_url,
+            webhook_server_url=config.webhook_server_url,
+            api_key=config.n8n_api_key,
+            **kwargs
+        )
+
     async def __aenter__(self):
         """Async context manager entry"""
         return self
@@ -111,97 +159,94 @@ class N8NClient:
     async def health_check(self) -> WorkflowHealthCheck:
         """
         Perform comprehensive health check of N8N and webhook services
-        """
-        start_time = datetime.now()
-
-        # Check N8N API connectivity
-        n8n_status = await self._check_n8n_api()
 
-        # Check webhook server status
-        webhook_status = await self._check_webhook_server()
-
-        # Get active workflow count
-        active_workflows = await self._get_active_workflow_count()
+        Results are reused for ``health_cache_ttl`` seconds, and concurrent
+        callers wait for a single round of probes instead of starting their own.
+        """
+        async with self._health_lock:
+            cached = self._health_cache
+            if cached and time.monotonic() - cached[0] < self.health_cache_ttl:
+                return cached[1]
 
-        # Check service endpoints
-        service_endpoints = await self._check_service_endpoints()
+            health = await self._run_health_check()
+            self._health_cache = (time.monotonic(), health)
+            return health
 
-        # Determine overall status
-        overall_status = "healthy" if n8n_status and webhook_status else "degraded"
-        if not n8n_status and not webhook_status:
-            overall_status = "unhealthy"
-
-        return WorkflowHealthCheck(
-            status=overall_status,
-            n8n_connection=n8n_status,
-            webhook_server_status=webhook_status,
-            active_workflows=active_workflows,
-            queue_size=0,  # Would be implemented with actual queue system
-            last_health_check=start_time,
-            service_endpoints=service_endpoints
-        )
+    def clear_health_cache(self):
+        """Force the next health check to probe the services again"""
+        self._health_cache = None
 
     async def trigger_workflow(
         self,
         workflow_type: WorkflowType,
         data: Dict[str, Any],
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        triggered_at: Optional[datetime] = None
     ) -> WorkflowExecution:
         """
         Trigger a specific N8N workflow through webhook
+
+        ``triggered_at`` lets callers such as batch triggers share a single
+        timestamp instead of reading the clock for every workflow.
         """
         config = self.workflow_configs.get(workflow_type)
         if not config:
             raise N8NAPIError(f"Unknown workflow type: {workflow_type}")
 
         # Generate execution ID
-        execution_id = f"{workflow_type.value}_{int(time.time() * 1000)}"
+        workflow_value = WORKFLOW_TYPE_VALUES[workflow_type]
+        execution_id = f"{workflow_value}_{time.monotonic_ns():x}"
+
+        # Capture the start once for the payload, record and duration
+        started_at = datetime.now()
+        started_monotonic = time.monotonic()
 
         # Prepare workflow data
         workflow_data = {
             **data,
-            "triggeredAt": datetime.now().isoformat(),
+            "triggeredAt": (triggered_at or started_at).isoformat(),
             "source": "sanzo-n8n-mcp",
-            "workflowType": workflow_type.value,
+            "workflowType": workflow_value,
             "executionId": execution_id,
             "correlationId": correlation_id
         }
 
-        # Create execution record
-        execution = WorkflowExecution(
+        # Create execution record (fields are locally derived, skip validation)
+        execution = WorkflowExecution.model_construct(
             execution_id=execution_id,
             workflow_type=workflow_type,
             status=WorkflowStatus.PENDING,
             input_data=workflow_data,
-            started_at=datetime.now(),
+            started_at=started_at,
             correlation_id=correlation_id
         )
 
         try:
             # Use webhook server as proxy to N8N
-            webhook_endpoint = f"{self.webhook_server_url}/api/webhooks/{workflow_type.value}"
+            webhook_endpoint = self._endpoint_by_type[workflow_type]
 
             execution.status = WorkflowStatus.RUNNING
-            response = await self.client.post(webhook_endpoint, json=workflow_data)
+            response = await self.client.post(
+                webhook_endpoint,
+                content=orjson.dumps(workflow_data, option=orjson.OPT_NON_STR_KEYS)
+            )
 
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 execution.status = WorkflowStatus.COMPLETED
                 execution.output_data = result
                 execution.n8n_execution_id = result.get("workflowId")
-                execution.completed_at = datetime.now()
-                execution.duration_seconds = (
-                    execution.completed_at - execution.started_at
-                ).total_seconds()
             else:
                 execution.status = WorkflowStatus.FAILED
                 execution.error_message = f"HTTP {response.status_code}: {response.text}"
-                execution.completed_at = datetime.now()
 
         except Exception as e:
             execution.status = WorkflowStatus.FAILED
             execution.error_message = str(e)
+
+        finally:
             execution.completed_at = datetime.now()
+            execution.duration_seconds = time.monotonic() - started_monotonic
 
         return execution
 
@@ -211,14 +256,33 @@ class N8NClient:
         shared_data: Dict[str, Any],
         individual_data: Optional[Dict[WorkflowType, Dict[str, Any]]] = None,
         delay_ms: int = 0,
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        max_concurrency: int = 10
     ) -> List[WorkflowExecution]:
         """
-        Trigger multiple workflows in sequence or parallel
+        Trigger multiple workflows concurrently
+
+        Workflows are staggered by ``delay_ms`` when given, and at most
+        ``max_concurrency`` webhook requests are in flight at once.
         """
-        executions = []
         individual_data = individual_data or {}
-
+        triggered_at = datetime.now()
+        batch_id = correlation_id or f"batch_{int(triggered_at.timestamp())}"
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(index: int, workflow_type: WorkflowType, workflow_data: Dict[str, Any]):
+            # Stagger start times instead of serializing executions
+            if delay_ms > 0 and index > 0:
+                await asyncio.sleep(index * delay_ms / 1000)
+            async with semaphore:
+                return await self.trigger_workflow(
+                    workflow_type=workflow_type,
+                    data=workflow_data,
+                    correlation_id=correlation_id,
+                    triggered_at=triggered_at
+                )
+
+        tasks = []
         for i, workflow_type in enumerate(workflow_types):
             # Merge shared and individual data
             workflow_data = {**shared_data}
@@ -226,23 +290,19 @@ class N8NClient:
                 workflow_data.update(individual_data[workflow_type])
 
             # Add batch metadata
-            workflow_data["batchId"] = correlation_id or f"batch_{int(time.time())}"
+            workflow_data["batchId"] = batch_id
             workflow_data["batchIndex"] = i
             workflow_data["batchTotal"] = len(workflow_types)
 
-            # Execute workflow
-            execution = await self.trigger_workflow(
-                workflow_type=workflow_type,
-                data=workflow_data,
-                correlation_id=correlation_id
-            )
-            executions.append(execution)
-
-            # Add delay between executions if specified
-            if delay_ms > 0 and i < len(workflow_types) - 1:
-                await asyncio.sleep(delay_ms / 1000)
+            tasks.append(asyncio.create_task(run(i, workflow_type, workflow_data)))
 
-        return executions
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            # After a failure, stop the siblings before they post to N8N
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def get_workflow_execution(self, execution_id: str) -> Optional[WorkflowExecution]:
         """
@@ -255,12 +315,12 @@ class N8NClient:
             response = await self.client.get(url)
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 # Convert N8N execution data to our model
                 return self._convert_n8n_execution(data)
 
         except Exception as e:
-            print(f"Error getting execution {execution_id}: {e}")
+            logger.warning("Error getting execution %s: %s", execution_id, e)
 
         return None
 
@@ -274,26 +334,15 @@ class N8NClient:
         List recent workflow executions with optional filters
         """
         try:
-            params = {"limit": limit}
-            if workflow_type:
-                params["workflowType"] = workflow_type.value
-            if status:
-                params["status"] = status.value
-
-            url = f"{self.n8n_base_url}/api/v1/executions"
-            response = await self.client.get(url, params=params)
-
-            if response.status_code == 200:
-                data = response.json()
-                executions = []
-                for item in data.get("data", []):
-                    execution = self._convert_n8n_execution(item)
-                    if execution:
-                        executions.append(execution)
-                return executions
+            executions = []
+            for item in await self._fetch_execution_records(workflow_type, status, limit):
+                execution = self._convert_n8n_execution(item)
+                if execution:
+                    executions.append(execution)
+            return executions
 
         except Exception as e:
-            print(f"Error listing executions: {e}")
+            logger.warning("Error listing executions: %s", e)
 
         return []
 
@@ -307,7 +356,7 @@ class N8NClient:
             return response.status_code == 200
 
         except Exception as e:
-            print(f"Error cancelling execution {execution_id}: {e}")
+            logger.warning("Error cancelling execution %s: %s", execution_id, e)
             return False
 
     async def get_workflow_metrics(self, workflow_type: WorkflowType) -> Dict[str, Any]:
@@ -325,12 +374,20 @@ class N8NClient:
                 "success_rate": 0.0
             }
 
+        # Aggregate counts and durations in a single pass
         total = len(executions)
-        successful = len([e for e in executions if e.status == WorkflowStatus.COMPLETED])
-        failed = len([e for e in executions if e.status == WorkflowStatus.FAILED])
-
-        durations = [e.duration_seconds for e in executions if e.duration_seconds]
-        avg_duration = sum(durations) / len(durations) if durations else 0.0
+        successful = failed = duration_count = 0
+        duration_sum = 0.0
+        for execution in executions:
+            if execution.status == WorkflowStatus.COMPLETED:
+                successful += 1
+            elif execution.status == WorkflowStatus.FAILED:
+                failed += 1
+            if execution.duration_seconds:
+                duration_sum += execution.duration_seconds
+                duration_count += 1
+
+        avg_duration = duration_sum / duration_count if duration_count else 0.0
 
         return {
             "total_executions": total,
@@ -341,10 +398,37 @@ class N8NClient:
         }
 
     # Private helper methods
+    async def _run_health_check(self) -> WorkflowHealthCheck:
+        """Probe N8N and webhook services and build a health check result"""
+        start_time = datetime.now()
+
+        # Run all independent probes concurrently
+        n8n_status, webhook_status, active_workflows, service_endpoints = await asyncio.gather(
+            self._check_n8n_api(),
+            self._check_webhook_server(),
+            self._get_active_workflow_count(),
+            self._check_service_endpoints()
+        )
+
+        # Determine overall status
+        overall_status = "healthy" if n8n_status and webhook_status else "degraded"
+        if not n8n_status and not webhook_status:
+            overall_status = "unhealthy"
+
+        return WorkflowHealthCheck.model_construct(
+            status=overall_status,
+            n8n_connection=n8n_status,
+            webhook_server_status=webhook_status,
+            active_workflows=active_workflows,
+            queue_size=0,  # Would be implemented with actual queue system
+            last_health_check=start_time,
+            service_endpoints=service_endpoints
+        )
+
     async def _check_n8n_api(self) -> bool:
         """Check N8N API connectivity"""
         try:
-            response = await self.client.get(f"{self.n8n_base_url}/api/v1/workflows")
+            response = await self.client.get(self._probe_urls["n8n_api"])
             return response.status_code == 200
         except Exception:
             return False
@@ -352,34 +436,52 @@ class N8NClient:
     async def _check_webhook_server(self) -> bool:
         """Check webhook server connectivity"""
         try:
-            response = await self.client.get(f"{self.webhook_server_url}/api/health")
+            response = await self.client.get(self._probe_urls["webhook_server"])
             return response.status_code == 200
         except Exception:
             return False
 
+    async def _fetch_execution_records(
+        self,
+        workflow_type: Optional[WorkflowType] = None,
+        status: Optional[WorkflowStatus] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Fetch raw N8N execution records without converting them"""
+        params = {"limit": limit}
+        if workflow_type:
+            params["workflowType"] = WORKFLOW_TYPE_VALUES[workflow_type]
+        if status:
+            params["status"] = status.value
+
+        response = await self.client.get(self._executions_url, params=params)
+
+        if response.status_code != 200:
+            return []
+        return orjson.loads(response.content).get("data", [])
+
     async def _get_active_workflow_count(self) -> int:
         """Get count of currently running workflows"""
-        executions = await self.list_workflow_executions(status=WorkflowStatus.RUNNING)
-        return len(executions)
+        # Only the count is needed, so skip building execution models
+        try:
+            records = await self._fetch_execution_records(status=WorkflowStatus.RUNNING)
+        except Exception as e:
+            logger.warning("Error counting active executions: %s", e)
+            return 0
+        return len(records)
 
     async def _check_service_endpoints(self) -> Dict[str, bool]:
         """Check status of various service endpoints"""
-        endpoints = {
-            "n8n_api": f"{self.n8n_base_url}/api/v1/workflows",
-            "webhook_server": f"{self.webhook_server_url}/api/health",
-            "sanzo_api": "http://localhost:3000/api/health",
-            "photo_analysis": "http://localhost:3002/api/health"
-        }
-
-        status = {}
-        for name, url in endpoints.items():
-            try:
-                response = await self.client.get(url)
-                status[name] = response.status_code == 200
-            except Exception:
-                status[name] = False
+        endpoints = self._probe_urls
+        results = await asyncio.gather(
+            *(self.client.get(url) for url in endpoints.values()),
+            return_exceptions=True
+        )
 
-        return status
+        return {
+            name: not isinstance(result, BaseException) and result.status_code == 200
+            for name, result in zip(endpoints, results)
+        }
 
     def _convert_n8n_execution(self, n8n_data: Dict[str, Any]) -> Optional[WorkflowExecution]:
         """Convert N8N execution data to our model"""
@@ -395,5 +497,5 @@ class N8NClient:
                 n8n_execution_id=n8n_data.get("id")
             )
         except Exception as e:
-            print(f"Error converting N8N execution data: {e}")
+            logger.warning("Error converting N8N execution data: %s", e)
             return None
\ No newline at end of file
@@ -3,14 +3,13 @@ Sanzo N8N MCP Server - Main server implementation with workflow management tools
 """
 
 import asyncio
-import json
 import os
-import uuid
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from fastmcp import FastMCP
-from pydantic import BaseModel, Field
+from pydantic import Field, validate_call
 
 from .models import (
     WorkflowType,
@@ -28,31 +27,66 @@ from .models import (
 from .n8n_client import N8NClient
 from .workflow_manager import WorkflowManager
 
+# Reverse lookup for workflow type values received from tool calls
+_WORKFLOW_TYPE_BY_VALUE: Dict[str, WorkflowType] = {wt.value: wt for wt in WorkflowType}
+
+
+def _short_id() -> str:
+    """Generate a short random hex id for correlation ids"""
+    return os.urandom(4).hex()
+
+
+# Environment variable read for each ServerConfig field
+_CONFIG_ENV_VARS: Dict[str, str] = {
+    "n8n_base_url": "N8N_BASE_URL",
+    "webhook_base_url": "N8N_WEBHOOK_BASE_URL",
+    "webhook_server_url": "WEBHOOK_SERVER_URL",
+    "n8n_api_key": "N8N_API_KEY"
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """Environment-derived connection settings for the MCP server"""
+    n8n_base_url: str = "http://localhost:5678"
+    webhook_base_url: str = "http://localhost:5678/webhook"
+    webhook_server_url: str = "http://localhost:3003"
+    n8n_api_key: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "ServerConfig":
+        """Read configuration from environment variables, keeping the defaults for unset ones"""
+        return cls(**{
+            field: os.environ[variable]
+            for field, variable in _CONFIG_ENV_VARS.items()
+            if variable in os.environ
+        })
+
 
 class SanzoN8NMCPServer:
     """MCP Server for Sanzo Color Advisor N8N Integration"""
 
-    def __init__(self):
+    def __init__(self, response_cache_ttl: float = 5.0, response_cache_size: int = 256):
         self.mcp = FastMCP("Sanzo N8N Workflow Integration")
+        self.config: Optional[ServerConfig] = None
         self.n8n_client: Optional[N8NClient] = None
         self.workflow_manager: Optional[WorkflowManager] = None
+        # Validated tool handlers by name, filled in by _setup_tools
+        self.tools_by_name: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        # Short-lived cache for list_workflow_executions, which calls N8N
+        self.response_cache_ttl = response_cache_ttl
+        self.response_cache_size = response_cache_size
+        self._response_cache: Dict[Tuple, Tuple[float, Tuple[WorkflowExecution, ...]]] = {}
+        self._cache_generation = 0
         self._setup_tools()
 
-    async def initialize(self):
+    async def initialize(self, config: Optional[ServerConfig] = None):
         """Initialize the MCP server and dependencies"""
-        # Load configuration from environment
-        n8n_base_url = os.getenv("N8N_BASE_URL", "http://localhost:5678")
-        webhook_base_url = os.getenv("N8N_WEBHOOK_BASE_URL", "http://localhost:5678/webhook")
-        webhook_server_url = os.getenv("WEBHOOK_SERVER_URL", "http://localhost:3003")
-        n8n_api_key = os.getenv("N8N_API_KEY")
+        # Load configuration from environment unless provided
+        self.config = config or ServerConfig.from_env()
 
         # Initialize N8N client
-        self.n8n_client = N8NClient(
-            n8n_base_url=n8n_base_url,
-            webhook_base_url=webhook_base_url,
-            webhook_server_url=webhook_server_url,
-            api_key=n8n_api_key
-        )
+        self.n8n_client = N8NClient.from_config(self.config)
 
         # Initialize workflow manager
         self.workflow_manager = WorkflowManager(self.n8n_client)
@@ -62,18 +96,53 @@ class SanzoN8NMCPServer:
         """Cleanup resources"""
         if self.workflow_manager:
             await self.workflow_manager.stop()
+            self.workflow_manager = None
         if self.n8n_client:
             await self.n8n_client.close()
+            self.n8n_client = None
+
+    async def reset_state(self):
+        """Clear triggers, metrics and cached responses without re-initializing"""
+        if self.workflow_manager:
+            await self.workflow_manager.reset_state()
+        if self.n8n_client:
+            self.n8n_client.clear_health_cache()
+        self._invalidate_cache()
+
+    @property
+    def _manager(self) -> WorkflowManager:
+        """Workflow manager for the tool handlers; raises until initialize() has run"""
+        if self.workflow_manager is None:
+            raise RuntimeError("Workflow manager not initialized")
+        return self.workflow_manager
+
+    @property
+    def _client(self) -> N8NClient:
+        """N8N client for the tool handlers; raises until initialize() has run"""
+        if self.n8n_client is None:
+            raise RuntimeError("N8N client not initialized")
+        return self.n8n_client
 
     def _setup_tools(self):
         """Setup all MCP tools for workflow management"""
+        # Handlers look the dependencies up at call time through _manager and
+        # _client, so tools registered in the constructor use whatever
+        # initialize() set up and fail clearly before it or after cleanup()
+        def tool(name: str) -> Callable:
+            """Register a handler with FastMCP and index it by name"""
+            def register(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+                self.mcp.add_tool(func, name=name)
+                # Validate arguments and fill Field defaults like FastMCP does
+                self.tools_by_name[name] = validate_call(func)
+                return func
+            return register
 
         # Tool 1: Execute Single Workflow
-        @self.mcp.tool("execute_workflow")
+        @tool("execute_workflow")
         async def execute_workflow(
             workflow_type: WorkflowType = Field(..., description="Type of workflow to execute"),
             data: Dict[str, Any] = Field(..., description="Input data for the workflow"),
-            priority: int = Field(default=5, ge=1, le=10, description="Execution priority (1-10)"),
+            priority: int = Field(default=5, ge=1, le=10, description="Execution priority (1-10, higher runs first)"),
             correlation_id: Optional[str] = Field(None, description="Optional correlation ID for tracking"),
             timeout_seconds: Optional[int] = Field(None, description="Custom timeout in seconds")
         ) -> WorkflowExecution:
@@ -83,19 +152,16 @@ class SanzoN8NMCPServer:
             This tool triggers the specified workflow type and returns the execution details
             including status, output data, and execution metrics.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
-            return await self.workflow_manager.execute_workflow(
+            return await self._invalidating_cache(self._manager.execute_workflow(
                 workflow_type=workflow_type,
                 data=data,
                 priority=priority,
                 correlation_id=correlation_id,
                 timeout_override=timeout_seconds
-            )
+            ))
 
         # Tool 2: Execute Batch Workflows
-        @self.mcp.tool("execute_batch_workflows")
+        @tool("execute_batch_workflows")
         async def execute_batch_workflows(
             workflows: List[WorkflowType] = Field(..., description="List of workflow types to execute"),
             shared_data: Dict[str, Any] = Field(default_factory=dict, description="Data shared across all workflows"),
@@ -111,19 +177,15 @@ class SanzoN8NMCPServer:
             Execute multiple workflows as a batch operation.
 
             This tool allows orchestrating multiple workflows with shared and individual data,
-            optional delays between executions, and fail-fast behavior.
+            optional delays between executions, and fail-fast behavior. Execution results
+            are returned in the order the workflows were requested.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
             # Convert individual_data keys to WorkflowType enum
-            individual_data_typed = {}
-            for workflow_str, data in individual_data.items():
-                try:
-                    workflow_type = WorkflowType(workflow_str)
-                    individual_data_typed[workflow_type] = data
-                except ValueError:
-                    continue
+            individual_data_typed = {
+                _WORKFLOW_TYPE_BY_VALUE[workflow_str]: data
+                for workflow_str, data in individual_data.items()
+                if workflow_str in _WORKFLOW_TYPE_BY_VALUE
+            }
 
             batch_request = BatchWorkflowRequest(
                 workflows=workflows,
@@ -134,10 +196,10 @@ class SanzoN8NMCPServer:
                 correlation_id=correlation_id
             )
 
-            return await self.workflow_manager.execute_batch_workflows(batch_request)
+            return await self._invalidating_cache(self._manager.execute_batch_workflows(batch_request))
 
         # Tool 3: Get Workflow Status
-        @self.mcp.tool("get_workflow_status")
+        @tool("get_workflow_status")
         async def get_workflow_status(
             execution_id: str = Field(..., description="Workflow execution ID to check")
         ) -> Optional[WorkflowExecution]:
@@ -146,13 +208,10 @@ class SanzoN8NMCPServer:
 
             Returns the execution details including status, duration, output data, and any errors.
             """
-            if not self.n8n_client:
-                raise RuntimeError("N8N client not initialized")
-
-            return await self.n8n_client.get_workflow_execution(execution_id)
+            return await self._client.get_workflow_execution(execution_id)
 
         # Tool 4: List Recent Executions
-        @self.mcp.tool("list_workflow_executions")
+        @tool("list_workflow_executions")
         async def list_workflow_executions(
             workflow_type: Optional[WorkflowType] = Field(None, description="Filter by workflow type"),
             status: Optional[WorkflowStatus] = Field(None, description="Filter by execution status"),
@@ -163,17 +222,17 @@ class SanzoN8NMCPServer:
 
             Returns a list of workflow executions that can be filtered by type and status.
             """
-            if not self.n8n_client:
-                raise RuntimeError("N8N client not initialized")
-
-            return await self.n8n_client.list_workflow_executions(
-                workflow_type=workflow_type,
-                status=status,
-                limit=limit
+            return await self._cached_executions(
+                (workflow_type, status, limit),
+                lambda: self._client.list_workflow_executions(
+                    workflow_type=workflow_type,
+                    status=status,
+                    limit=limit
+                )
             )
 
         # Tool 5: Get Workflow Metrics
-        @self.mcp.tool("get_workflow_metrics")
+        @tool("get_workflow_metrics")
         async def get_workflow_metrics(
             workflow_type: WorkflowType = Field(..., description="Workflow type to get metrics for")
         ) -> WorkflowMetrics:
@@ -183,13 +242,10 @@ class SanzoN8NMCPServer:
             Returns metrics including total executions, success rate, average duration,
             and recent performance trends.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
-            return await self.workflow_manager.get_workflow_metrics(workflow_type)
+            return await self._manager.get_workflow_metrics(workflow_type)
 
         # Tool 6: Health Check
-        @self.mcp.tool("health_check")
+        @tool("health_check")
         async def health_check() -> WorkflowHealthCheck:
             """
             Perform a comprehensive health check of the N8N integration system.
@@ -197,13 +253,10 @@ class SanzoN8NMCPServer:
             Checks connectivity to N8N, webhook server, and other dependent services.
             Returns overall system status and individual component health.
             """
-            if not self.n8n_client:
-                raise RuntimeError("N8N client not initialized")
-
-            return await self.n8n_client.health_check()
+            return await self._client.health_check()
 
         # Tool 7: Cancel Workflow
-        @self.mcp.tool("cancel_workflow")
+        @tool("cancel_workflow")
         async def cancel_workflow(
             execution_id: str = Field(..., description="Execution ID of workflow to cancel")
         ) -> bool:
@@ -212,13 +265,10 @@ class SanzoN8NMCPServer:
 
             Attempts to stop the workflow execution and returns success status.
             """
-            if not self.n8n_client:
-                raise RuntimeError("N8N client not initialized")
-
-            return await self.n8n_client.cancel_workflow_execution(execution_id)
+            return await self._invalidating_cache(self._client.cancel_workflow_execution(execution_id))
 
         # Tool 8: Quick Analysis Workflow
-        @self.mcp.tool("trigger_customer_analysis")
+        @tool("trigger_customer_analysis")
         async def trigger_customer_analysis(
             analysis_type: str = Field(..., description="Type of analysis (photo, text, preferences)"),
             room_type: str = Field(..., description="Room type for analysis"),
@@ -233,26 +283,23 @@ class SanzoN8NMCPServer:
             This is a convenience tool for triggering the most common workflow with
             proper data structure for color analysis.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
             workflow_data = {
                 "analysisType": analysis_type,
                 "roomType": room_type,
                 "customerEmail": customer_email,
                 "customerName": customer_name,
-                "ageGroup": age_group,
-                **additional_data
+                "ageGroup": age_group
             }
+            workflow_data.update(additional_data)
 
-            return await self.workflow_manager.execute_workflow(
+            return await self._invalidating_cache(self._manager.execute_workflow(
                 workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
                 data=workflow_data,
-                correlation_id=f"quick_analysis_{uuid.uuid4().hex[:8]}"
-            )
+                correlation_id=f"quick_analysis_{_short_id()}"
+            ))
 
         # Tool 9: Photo Analysis Processing
-        @self.mcp.tool("trigger_photo_analysis_processing")
+        @tool("trigger_photo_analysis_processing")
         async def trigger_photo_analysis_processing(
             extracted_colors: List[str] = Field(..., description="List of extracted color codes"),
             room_context: Dict[str, Any] = Field(..., description="Room context information"),
@@ -266,9 +313,6 @@ class SanzoN8NMCPServer:
             This tool processes the results of photo analysis and generates
             appropriate follow-up actions and recommendations.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
             workflow_data = {
                 "extractedColors": extracted_colors,
                 "roomContext": room_context,
@@ -277,14 +321,14 @@ class SanzoN8NMCPServer:
                 "metadata": metadata
             }
 
-            return await self.workflow_manager.execute_workflow(
+            return await self._invalidating_cache(self._manager.execute_workflow(
                 workflow_type=WorkflowType.PHOTO_ANALYSIS_PROCESSING,
                 data=workflow_data,
-                correlation_id=f"photo_analysis_{uuid.uuid4().hex[:8]}"
-            )
+                correlation_id=f"photo_analysis_{_short_id()}"
+            ))
 
         # Tool 10: CRM Lead Management
-        @self.mcp.tool("trigger_crm_lead_management")
+        @tool("trigger_crm_lead_management")
         async def trigger_crm_lead_management(
             customer_name: str = Field(..., description="Customer name"),
             customer_email: str = Field(..., description="Customer email address"),
@@ -300,9 +344,6 @@ class SanzoN8NMCPServer:
             This tool creates and manages leads in the CRM system based on
             customer analysis data and engagement.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
             workflow_data = {
                 "customerName": customer_name,
                 "customerEmail": customer_email,
@@ -313,14 +354,14 @@ class SanzoN8NMCPServer:
                 "leadSource": lead_source
             }
 
-            return await self.workflow_manager.execute_workflow(
+            return await self._invalidating_cache(self._manager.execute_workflow(
                 workflow_type=WorkflowType.CRM_LEAD_MANAGEMENT,
                 data=workflow_data,
-                correlation_id=f"crm_lead_{uuid.uuid4().hex[:8]}"
-            )
+                correlation_id=f"crm_lead_{_short_id()}"
+            ))
 
         # Tool 11: Follow-up Sequences
-        @self.mcp.tool("trigger_follow_up_sequences")
+        @tool("trigger_follow_up_sequences")
         async def trigger_follow_up_sequences(
             follow_up_type: str = Field(..., description="Type of follow-up (immediate, personal, targeted, basic)"),
             customer_data: Dict[str, Any] = Field(..., description="Customer information"),
@@ -334,9 +375,6 @@ class SanzoN8NMCPServer:
             This tool manages automated follow-up communications based on
             customer engagement level and analysis results.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
             workflow_data = {
                 "followUpType": follow_up_type,
                 "customerData": customer_data,
@@ -345,27 +383,24 @@ class SanzoN8NMCPServer:
                 "delayHours": delay_hours
             }
 
-            return await self.workflow_manager.execute_workflow(
+            return await self._invalidating_cache(self._manager.execute_workflow(
                 workflow_type=WorkflowType.FOLLOW_UP_SEQUENCES,
                 data=workflow_data,
-                correlation_id=f"follow_up_{uuid.uuid4().hex[:8]}"
-            )
+                correlation_id=f"follow_up_{_short_id()}"
+            ))
 
         # Tool 12: Queue Management
-        @self.mcp.tool("get_queue_status")
+        @tool("get_queue_status")
         async def get_queue_status() -> Dict[str, Any]:
             """
             Get current workflow queue status and execution statistics.
 
             Returns information about queue size, running workflows, and system capacity.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
-            return await self.workflow_manager.get_queue_status()
+            return await self._manager.get_queue_status()
 
         # Tool 13: Add Automated Trigger
-        @self.mcp.tool("add_automated_trigger")
+        @tool("add_automated_trigger")
         async def add_automated_trigger(
             trigger_name: str = Field(..., description="Unique name for the trigger"),
             workflow_type: WorkflowType = Field(..., description="Workflow to trigger"),
@@ -381,9 +416,6 @@ class SanzoN8NMCPServer:
             This tool sets up automated triggers that can execute workflows based on
             schedules, events, or other conditions.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
             trigger_config = WorkflowTriggerConfig(
                 trigger_name=trigger_name,
                 workflow_type=workflow_type,
@@ -394,24 +426,21 @@ class SanzoN8NMCPServer:
                 data_template=data_template
             )
 
-            await self.workflow_manager.add_automated_trigger(trigger_config)
+            await self._manager.add_automated_trigger(trigger_config)
             return True
 
         # Tool 14: List Automated Triggers
-        @self.mcp.tool("list_automated_triggers")
+        @tool("list_automated_triggers")
         async def list_automated_triggers() -> List[WorkflowTriggerConfig]:
             """
             List all configured automated workflow triggers.
 
             Returns all trigger configurations including their status and settings.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
-            return await self.workflow_manager.list_automated_triggers()
+            return await self._manager.list_automated_triggers()
 
         # Tool 15: Remove Automated Trigger
-        @self.mcp.tool("remove_automated_trigger")
+        @tool("remove_automated_trigger")
         async def remove_automated_trigger(
             trigger_name: str = Field(..., description="Name of trigger to remove")
         ) -> bool:
@@ -420,15 +449,62 @@ class SanzoN8NMCPServer:
 
             Stops and removes the specified automated trigger configuration.
             """
-            if not self.workflow_manager:
-                raise RuntimeError("Workflow manager not initialized")
-
-            return await self.workflow_manager.remove_automated_trigger(trigger_name)
+            return await self._manager.remove_automated_trigger(trigger_name)
 
     def get_server(self) -> FastMCP:
         """Get the MCP server instance"""
         return self.mcp
 
+    # Private helper methods
+
+    async def _cached_executions(
+        self,
+        key: Tuple,
+        fetch: Callable[[], Awaitable[List[WorkflowExecution]]]
+    ) -> List[WorkflowExecution]:
+        """
+        Return executions cached for ``key``, fetching them if missing or expired
+
+        Entries are stored as tuples and handed out as new lists of shallow
+        copies, so callers can modify what they get without touching the cache.
+        A fetch replaces the cached entry only if it started after that entry's
+        fetch and after the last invalidation, so a slow response never
+        overwrites a fresher one.
+        """
+        started = time.monotonic()
+        cached = self._response_cache.get(key)
+        if cached and started - cached[0] < self.response_cache_ttl:
+            return [execution.model_copy() for execution in cached[1]]
+
+        generation = self._cache_generation
+        executions = tuple(await fetch())
+
+        current = self._response_cache.get(key)
+        if generation == self._cache_generation and (current is None or current[0] <= started):
+            if current is None and len(self._response_cache) >= self.response_cache_size:
+                # Drop expired entries first, then the oldest insertion
+                now = time.monotonic()
+                for stale_key in [k for k, (ts, _) in self._response_cache.items()
+                                  if now - ts >= self.response_cache_ttl]:
+                    del self._response_cache[stale_key]
+                if len(self._response_cache) >= self.response_cache_size:
+                    del self._response_cache[next(iter(self._response_cache))]
+            self._response_cache[key] = (started, executions)
+
+        return [execution.model_copy() for execution in executions]
+
+    def _invalidate_cache(self):
+        """Forget cached executions and discard fetches already in flight"""
+        self._response_cache.clear()
+        self._cache_generation += 1
+
+    async def _invalidating_cache(self, call: Awaitable[Any]) -> Any:
+        """Await a tool call that changes executions, then drop the cached listings"""
+        try:
+            return await call
+        finally:
+            self._invalidate_cache()
+
 
 # Server instance for external use
 async def create_server() -> SanzoN8NMCPServer:
@@ -438,45 +514,74 @@ async def create_server() -> SanzoN8NMCPServer:
     return server
 
 
+# Startup banner, written in a single call
+_BANNER = "\n".join([
+    "🚀 Sanzo N8N MCP Server starting...",
+    "🔗 Available tools:",
+    "   • execute_workflow - Execute single workflow",
+    "   • execute_batch_workflows - Execute multiple workflows",
+    "   • get_workflow_status - Check execution status",
+    "   • list_workflow_executions - List recent executions",
+    "   • get_workflow_metrics - Get performance metrics",
+    "   • health_check - System health check",
+    "   • cancel_workflow - Cancel running workflow",
+    "   • trigger_customer_analysis - Quick customer analysis",
+    "   • trigger_photo_analysis_processing - Process photo analysis",
+    "   • trigger_crm_lead_management - Manage CRM leads",
+    "   • trigger_follow_up_sequences - Automated follow-ups",
+    "   • get_queue_status - Queue management",
+    "   • add_automated_trigger - Configure automation",
+    "   • list_automated_triggers - List automations",
+    "   • remove_automated_trigger - Remove automation",
+    "✅ Server ready for MCP connections",
+]) + "\n"
+
+
 # CLI entry point
 async def main():
     """Main entry point for running the MCP server"""
     import sys
     import signal
 
+    # Let tasks whose coroutines finish without suspending skip a loop
+    # round-trip; set before create_server so startup tasks benefit too
+    if sys.version_info >= (3, 12):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     server = await create_server()
 
-    # Setup signal handlers for graceful shutdown
-    def signal_handler(signum, frame):
+    # Setup signal handlers for graceful shutdown; cleanup runs in the
+    # finally block below instead of racing process exit
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+
+    def signal_handler(signum, frame=None):
         print(f"\nReceived signal {signum}, shutting down...")
-        asyncio.create_task(server.cleanup())
-        sys.exit(0)
+        loop.call_soon_threadsafe(stop.set)
 
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, signal_handler, signum)
+        except NotImplementedError:
+            # Windows event loops do not support add_signal_handler
+            signal.signal(signum, signal_handler)
 
     try:
-        print("🚀 Sanzo N8N MCP Server starting...")
-        print("🔗 Available tools:")
-        print("   • execute_workflow - Execute single workflow")
-        print("   • execute_batch_workflows - Execute multiple workflows")
-        print("   • get_workflow_status - Check execution status")
-        print("   • list_workflow_executions - List recent executions")
-        print("   • get_workflow_metrics - Get performance metrics")
-        print("   • health_check - System health check")
-        print("   • cancel_workflow - Cancel running workflow")
-        print("   • trigger_customer_analysis - Quick customer analysis")
-        print("   • trigger_photo_analysis_processing - Process photo analysis")
-        print("   • trigger_crm_lead_management - Manage CRM leads")
-        print("   • trigger_follow_up_sequences - Automated follow-ups")
-        print("   • get_queue_status - Queue management")
-        print("   • add_automated_trigger - Configure automation")
-        print("   • list_automated_triggers - List automations")
-        print("   • remove_automated_trigger - Remove automation")
-        print("✅ Server ready for MCP connections")
-
-        # Run the server
-        await server.get_server().run()
+        sys.stdout.write(_BANNER)
+        sys.stdout.flush()
+
+        # Run the server until it exits or a shutdown signal arrives; FastMCP's
+        # run() starts its own event loop, so use the async stdio entry point
+        run_task = asyncio.ensure_future(server.get_server().run_stdio_async())
+        stop_task = asyncio.ensure_future(stop.wait())
+        done, pending = await asyncio.wait(
+            {run_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if run_task in done:
+            run_task.result()
 
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
@@ -488,4 +593,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop is a faster drop-in event loop; it is not available on Windows
+    try:
+        import uvloop
+        runner = uvloop.run
+    except ImportError:
+        runner = asyncio.run
+    runner(main())
\ No newline at end of file
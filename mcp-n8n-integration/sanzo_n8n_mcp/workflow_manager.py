@@ -3,11 +3,16 @@ Workflow Manager for orchestrating N8N workflows and automation
 """
 
 import asyncio
+import bisect
+import heapq
+import itertools
 import json
-import uuid
+import logging
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
 from collections import defaultdict, deque
+from secrets import token_hex
 
 from .models import (
     WorkflowType,
@@ -17,25 +22,47 @@ from .models import (
     WorkflowTriggerConfig,
     BatchWorkflowRequest,
     BatchWorkflowResult,
-    TriggerType
+    TriggerType,
+    WORKFLOW_TYPE_VALUES
 )
 from .n8n_client import N8NClient
 
+logger = logging.getLogger(__name__)
+
+
+def _trim_before(times: Deque[datetime], cutoff: datetime):
+    """Drop sorted timestamps at or before cutoff from the front of the deque"""
+    while times and times[0] <= cutoff:
+        times.popleft()
+
 
 class WorkflowQueue:
-    """Simple in-memory workflow queue"""
+    """
+    Simple in-memory workflow priority queue
 
-    def __init__(self, max_size: int = 1000):
-        self.queue = deque(maxlen=max_size)
+    Higher priority values run first; equal priorities run in arrival order.
+    """
+
+    def __init__(self, max_size: int = 1000, max_completed: int = 10000):
+        # Heap of (-priority, sequence, execution); the sequence breaks ties so
+        # executions themselves are never compared
+        self.queue: List[Tuple[int, int, WorkflowExecution]] = []
+        self.max_size = max_size
+        self._sequence = itertools.count()
+        self.max_completed = max_completed
         self.running_workflows: Set[str] = set()
         self.completed_workflows: Dict[str, WorkflowExecution] = {}
+        self.completion_futures: Dict[str, asyncio.Future] = {}
         self.max_concurrent = 5
+        # Set while the queue holds work so the processor can sleep until then
+        self.has_items = asyncio.Event()
 
-    def add_workflow(self, execution: WorkflowExecution) -> bool:
+    def add_workflow(self, execution: WorkflowExecution, priority: int = 5) -> bool:
         """Add workflow to queue"""
-        if len(self.queue) >= self.queue.maxlen:
+        if len(self.queue) >= self.max_size:
             return False
-        self.queue.append(execution)
+        heapq.heappush(self.queue, (-priority, next(self._sequence), execution))
+        self.has_items.set()
         return True
 
     def get_next_workflow(self) -> Optional[WorkflowExecution]:
@@ -44,7 +71,7 @@ class WorkflowQueue:
             return None
         if not self.queue:
             return None
-        return self.queue.popleft()
+        return heapq.heappop(self.queue)[2]
 
     def mark_running(self, execution_id: str):
         """Mark workflow as running"""
@@ -54,6 +81,26 @@ class WorkflowQueue:
         """Mark workflow as completed"""
         self.running_workflows.discard(execution.execution_id)
         self.completed_workflows[execution.execution_id] = execution
+        # Evict the oldest records once over capacity (dicts keep insertion order)
+        while len(self.completed_workflows) > self.max_completed:
+            del self.completed_workflows[next(iter(self.completed_workflows))]
+        future = self.completion_futures.pop(execution.execution_id, None)
+        if future is not None and not future.done():
+            future.set_result(execution)
+
+    def completion_future(self, execution_id: str) -> asyncio.Future:
+        """Get a future resolved with the execution once it is marked completed"""
+        future = self.completion_futures.get(execution_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.completion_futures[execution_id] = future
+        return future
+
+    async def wait_for_workflow(self):
+        """Wait until the queue holds at least one workflow"""
+        if not self.queue:
+            self.has_items.clear()
+            await self.has_items.wait()
 
     def get_queue_size(self) -> int:
         """Get current queue size"""
@@ -64,6 +111,48 @@ class WorkflowQueue:
         return len(self.running_workflows)
 
 
+class WorkflowStats:
+    """Running totals over the most recent executions of one workflow type"""
+
+    def __init__(self, max_size: int = 1000):
+        # (succeeded, failed, duration) per recorded execution, so evicted
+        # records are subtracted exactly as they were added
+        self.window: Deque[Tuple[bool, bool, float]] = deque(maxlen=max_size)
+        self.total = 0
+        self.successful = 0
+        self.failed = 0
+        self.duration_sum = 0.0
+        self.duration_count = 0
+        self.last_started_at: Optional[datetime] = None
+
+    def record(self, execution: WorkflowExecution):
+        """Add an execution, evicting the oldest once the window is full"""
+        if len(self.window) == self.window.maxlen:
+            self._apply(self.window[0], -1)
+
+        succeeded = execution.status == WorkflowStatus.COMPLETED
+        entry = (
+            succeeded,
+            execution.status == WorkflowStatus.FAILED,
+            (execution.duration_seconds or 0.0) if succeeded else 0.0
+        )
+        self.window.append(entry)
+        self._apply(entry, 1)
+
+        if self.last_started_at is None or execution.started_at > self.last_started_at:
+            self.last_started_at = execution.started_at
+
+    def _apply(self, entry: Tuple[bool, bool, float], sign: int):
+        """Add (sign=1) or subtract (sign=-1) one window entry from the totals"""
+        succeeded, failed, duration = entry
+        self.total += sign
+        self.successful += sign * succeeded
+        self.failed += sign * failed
+        if duration:
+            self.duration_sum += sign * duration
+            self.duration_count += sign
+
+
 class WorkflowManager:
     """
     High-level workflow orchestration and management
@@ -72,8 +161,19 @@ class WorkflowManager:
     def __init__(self, n8n_client: N8NClient):
         self.n8n_client = n8n_client
         self.queue = WorkflowQueue()
-        self.metrics_store: Dict[WorkflowType, List[WorkflowExecution]] = defaultdict(list)
+        self._concurrency = asyncio.Semaphore(self.queue.max_concurrent)
+        # Recent executions per type; the deque drops the oldest on append
+        self.max_executions_per_type = 1000
+        self.metrics_store: Dict[WorkflowType, Deque[WorkflowExecution]] = defaultdict(
+            lambda: deque(maxlen=self.max_executions_per_type)
+        )
+        self.stats: Dict[WorkflowType, WorkflowStats] = defaultdict(
+            lambda: WorkflowStats(self.max_executions_per_type)
+        )
+        # Start times within the last hour per type, for trigger rate limiting
+        self._recent_starts: Dict[WorkflowType, Deque[datetime]] = defaultdict(deque)
         self.trigger_configs: Dict[str, WorkflowTriggerConfig] = {}
+        self._enabled_triggers: List[WorkflowTriggerConfig] = []
         self.automation_tasks: Set[asyncio.Task] = set()
         self._running = False
 
@@ -94,6 +194,11 @@ class WorkflowManager:
         self.automation_tasks.add(task)
         task.add_done_callback(self.automation_tasks.discard)
 
+        # Start background task for retention cleanup
+        task = asyncio.create_task(self._process_cleanup())
+        self.automation_tasks.add(task)
+        task.add_done_callback(self.automation_tasks.discard)
+
     async def stop(self):
         """Stop the workflow manager and background tasks"""
         self._running = False
@@ -117,7 +222,7 @@ class WorkflowManager:
         """
         Execute a single workflow with proper queuing and tracking
         """
-        execution_id = f"{workflow_type.value}_{uuid.uuid4().hex[:8]}"
+        execution_id = f"{WORKFLOW_TYPE_VALUES[workflow_type]}_{token_hex(4)}"
 
         # Create execution record
         execution = WorkflowExecution(
@@ -130,7 +235,7 @@ class WorkflowManager:
         )
 
         # Add to queue for processing
-        if not self.queue.add_workflow(execution):
+        if not self.queue.add_workflow(execution, priority):
             execution.status = WorkflowStatus.FAILED
             execution.error_message = "Workflow queue is full"
             execution.completed_at = datetime.now()
@@ -138,27 +243,14 @@ class WorkflowManager:
 
         # Wait for execution to complete (with timeout)
         timeout = timeout_override or 300  # 5 minutes default
-        start_time = datetime.now()
-
-        while (datetime.now() - start_time).total_seconds() < timeout:
-            # Check if workflow completed
-            if execution.execution_id in self.queue.completed_workflows:
-                completed_execution = self.queue.completed_workflows[execution.execution_id]
-                self._update_metrics(completed_execution)
-                return completed_execution
+        completion = self.queue.completion_future(execution_id)
 
-            # Check if workflow is still running
-            if execution.execution_id in self.queue.running_workflows:
-                await asyncio.sleep(1)
-                continue
-
-            # Check if workflow is still in queue
-            if execution in self.queue.queue:
-                await asyncio.sleep(0.5)
-                continue
-
-            # If we get here, something went wrong
-            break
+        try:
+            completed_execution = await asyncio.wait_for(completion, timeout)
+            self._update_metrics(completed_execution)
+            return completed_execution
+        except asyncio.TimeoutError:
+            self.queue.completion_futures.pop(execution_id, None)
 
         # Timeout occurred
         execution.status = WorkflowStatus.TIMEOUT
@@ -173,124 +265,132 @@ class WorkflowManager:
     ) -> BatchWorkflowResult:
         """
         Execute multiple workflows as a batch operation
+
+        Workflows run concurrently and results are listed in request order;
+        ``stream_batch_workflows`` yields them in completion order instead. With
+        ``fail_fast`` they run one after another, so nothing past the first
+        failure is ever submitted.
         """
-        batch_id = batch_request.correlation_id or f"batch_{uuid.uuid4().hex[:8]}"
+        batch_id = batch_request.correlation_id or f"batch_{token_hex(4)}"
+        # Wall-clock time for the record, monotonic clock for the duration
         start_time = datetime.now()
+        start_monotonic = time.monotonic()
 
-        # Prepare execution tasks
-        execution_tasks = []
-        for i, workflow_type in enumerate(batch_request.workflows):
-            # Combine shared and individual data
-            workflow_data = {**batch_request.shared_data}
-            if workflow_type in batch_request.individual_data:
-                workflow_data.update(batch_request.individual_data[workflow_type])
+        delay_seconds = batch_request.delay_between_workflows / 1000
+        prepared = self._prepare_batch_data(batch_request, batch_id)
 
-            # Add batch metadata
-            workflow_data.update({
-                "batchId": batch_id,
-                "batchIndex": i,
-                "batchTotal": len(batch_request.workflows)
-            })
-
-            # Create execution task
-            if batch_request.delay_between_workflows > 0 and i > 0:
-                # Add delay before this workflow
-                await asyncio.sleep(batch_request.delay_between_workflows / 1000)
+        # Slots by request position, so results keep the order of the request
+        results: List[Optional[WorkflowExecution]] = [None] * len(prepared)
+        successful_count = 0
+        failed_count = 0
 
-            task = self.execute_workflow(
-                workflow_type=workflow_type,
-                data=workflow_data,
-                correlation_id=batch_id
-            )
-            execution_tasks.append(task)
+        def record(index: int, result: WorkflowExecution):
+            nonlocal successful_count, failed_count
+            results[index] = result
+            if result.status == WorkflowStatus.COMPLETED:
+                successful_count += 1
+            elif result.status in (WorkflowStatus.FAILED, WorkflowStatus.TIMEOUT):
+                failed_count += 1
 
-            # If fail_fast is enabled and we had a failure, stop creating more tasks
-            if batch_request.fail_fast and execution_tasks:
-                previous_result = await execution_tasks[-1]
-                if previous_result.status == WorkflowStatus.FAILED:
+        if batch_request.fail_fast:
+            # Submit each workflow only after the previous one completes, so a
+            # failure stops the rest before they ever reach the queue
+            for i, (workflow_type, workflow_data) in enumerate(prepared):
+                try:
+                    result = await self._execute_staggered(
+                        delay_seconds if i else 0, workflow_type, workflow_data, batch_id
+                    )
+                except Exception:
+                    failed_count += 1
                     break
 
-        # Execute all workflow tasks
-        if batch_request.fail_fast:
-            # Execute one by one, stopping on first failure
-            results = []
-            for task in execution_tasks:
-                result = await task
-                results.append(result)
+                record(i, result)
                 if result.status == WorkflowStatus.FAILED:
                     break
         else:
-            # Execute all in parallel
-            results = await asyncio.gather(*execution_tasks, return_exceptions=True)
-
-        # Process results
-        execution_results = []
-        successful_count = 0
-        failed_count = 0
-
-        for result in results:
-            if isinstance(result, WorkflowExecution):
-                execution_results.append(result)
-                if result.status == WorkflowStatus.COMPLETED:
-                    successful_count += 1
-                elif result.status in [WorkflowStatus.FAILED, WorkflowStatus.TIMEOUT]:
-                    failed_count += 1
-            else:
-                # Handle exceptions
-                failed_count += 1
-
-        completion_time = datetime.now()
-
-        return BatchWorkflowResult(
+            async def execute_indexed(
+                i: int, workflow_type: WorkflowType, workflow_data: Dict[str, Any]
+            ) -> Tuple[int, WorkflowExecution]:
+                return i, await self._execute_staggered(
+                    i * delay_seconds, workflow_type, workflow_data, batch_id
+                )
+
+            # Execute all workflows concurrently and account for each as it finishes
+            tasks = [
+                asyncio.create_task(execute_indexed(i, workflow_type, workflow_data))
+                for i, (workflow_type, workflow_data) in enumerate(prepared)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        record(*await next_done)
+                    except Exception:
+                        failed_count += 1
+            finally:
+                # Only does work when the caller itself is cancelled
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        duration_seconds = time.monotonic() - start_monotonic
+
+        return BatchWorkflowResult.model_construct(
             batch_id=batch_id,
             total_workflows=len(batch_request.workflows),
             successful_workflows=successful_count,
             failed_workflows=failed_count,
-            execution_results=execution_results,
+            execution_results=[result for result in results if result is not None],
             started_at=start_time,
-            completed_at=completion_time,
-            total_duration_seconds=(completion_time - start_time).total_seconds()
+            completed_at=start_time + timedelta(seconds=duration_seconds),
+            total_duration_seconds=duration_seconds
         )
 
-    async def get_workflow_metrics(self, workflow_type: WorkflowType) -> WorkflowMetrics:
-        """
-        Get comprehensive metrics for a workflow type
+    async def stream_batch_workflows(
+        self,
+        batch_request: BatchWorkflowRequest
+    ) -> AsyncIterator[WorkflowExecution]:
         """
-        executions = self.metrics_store.get(workflow_type, [])
-
-        if not executions:
-            return WorkflowMetrics(
-                workflow_type=workflow_type,
-                total_executions=0,
-                successful_executions=0,
-                failed_executions=0,
-                average_duration_seconds=0.0,
-                success_rate=0.0,
-                last_execution=None
-            )
+        Execute a batch concurrently and yield executions as they finish
 
-        total = len(executions)
-        successful = len([e for e in executions if e.status == WorkflowStatus.COMPLETED])
-        failed = len([e for e in executions if e.status == WorkflowStatus.FAILED])
+        Fast workflows are yielded without waiting for slower ones. Closing the
+        iterator early cancels the workflows that are still pending.
+        """
+        batch_id = batch_request.correlation_id or f"batch_{token_hex(4)}"
+        delay_seconds = batch_request.delay_between_workflows / 1000
 
-        # Calculate average duration for completed workflows
-        durations = [
-            e.duration_seconds for e in executions
-            if e.duration_seconds and e.status == WorkflowStatus.COMPLETED
+        tasks = [
+            asyncio.create_task(
+                self._execute_staggered(i * delay_seconds, workflow_type, workflow_data, batch_id)
+            )
+            for i, (workflow_type, workflow_data) in enumerate(
+                self._prepare_batch_data(batch_request, batch_id)
+            )
         ]
-        avg_duration = sum(durations) / len(durations) if durations else 0.0
 
-        # Get last execution time
-        last_execution = max(executions, key=lambda e: e.started_at).started_at if executions else None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-        return WorkflowMetrics(
+    async def get_workflow_metrics(self, workflow_type: WorkflowType) -> WorkflowMetrics:
+        """
+        Get comprehensive metrics for a workflow type
+        """
+        stats = self.stats.get(workflow_type) or WorkflowStats()
+
+        return WorkflowMetrics.model_construct(
             workflow_type=workflow_type,
-            total_executions=total,
-            successful_executions=successful,
-            failed_executions=failed,
-            average_duration_seconds=avg_duration,
-            success_rate=(successful / total * 100) if total > 0 else 0.0,
-            last_execution=last_execution
+            total_executions=stats.total,
+            successful_executions=stats.successful,
+            failed_executions=stats.failed,
+            average_duration_seconds=(
+                stats.duration_sum / stats.duration_count if stats.duration_count else 0.0
+            ),
+            success_rate=(stats.successful / stats.total * 100) if stats.total > 0 else 0.0,
+            last_execution=stats.last_started_at
         )
 
     async def add_automated_trigger(self, trigger_config: WorkflowTriggerConfig):
@@ -298,12 +398,16 @@ class WorkflowManager:
         Add an automated workflow trigger configuration
         """
         self.trigger_configs[trigger_config.trigger_name] = trigger_config
+        self._refresh_enabled_triggers()
 
     async def remove_automated_trigger(self, trigger_name: str) -> bool:
         """
         Remove an automated workflow trigger
         """
-        return self.trigger_configs.pop(trigger_name, None) is not None
+        removed = self.trigger_configs.pop(trigger_name, None) is not None
+        if removed:
+            self._refresh_enabled_triggers()
+        return removed
 
     async def list_automated_triggers(self) -> List[WorkflowTriggerConfig]:
         """
@@ -320,7 +424,7 @@ class WorkflowManager:
             "running_workflows": self.queue.get_running_count(),
             "completed_workflows": len(self.queue.completed_workflows),
             "max_concurrent": self.queue.max_concurrent,
-            "queue_capacity": self.queue.queue.maxlen
+            "queue_capacity": self.queue.max_size
         }
 
     async def cleanup_old_executions(self, retention_days: int = 7):
@@ -329,77 +433,147 @@ class WorkflowManager:
         """
         cutoff_date = datetime.now() - timedelta(days=retention_days)
 
-        # Clean metrics store
+        # Clean metrics store and rebuild the running totals from what remains
         for workflow_type in self.metrics_store:
-            self.metrics_store[workflow_type] = [
-                execution for execution in self.metrics_store[workflow_type]
-                if execution.started_at > cutoff_date
-            ]
+            self.metrics_store[workflow_type] = deque(
+                (execution for execution in self.metrics_store[workflow_type]
+                 if execution.started_at > cutoff_date),
+                maxlen=self.max_executions_per_type
+            )
+            stats = WorkflowStats(self.max_executions_per_type)
+            for execution in self.metrics_store[workflow_type]:
+                stats.record(execution)
+            self.stats[workflow_type] = stats
+
+        # Drop start times that fell out of the rate-limiting window
+        window_start = datetime.now() - timedelta(hours=1)
+        for workflow_type in list(self._recent_starts):
+            _trim_before(self._recent_starts[workflow_type], window_start)
+            if not self._recent_starts[workflow_type]:
+                del self._recent_starts[workflow_type]
+
+        # Clean completed workflows in a single rebuild
+        self.queue.completed_workflows = {
+            execution_id: execution
+            for execution_id, execution in self.queue.completed_workflows.items()
+            if execution.started_at >= cutoff_date
+        }
 
-        # Clean completed workflows
-        to_remove = [
-            execution_id for execution_id, execution in self.queue.completed_workflows.items()
-            if execution.started_at < cutoff_date
-        ]
-        for execution_id in to_remove:
-            del self.queue.completed_workflows[execution_id]
+    async def reset_state(self):
+        """
+        Forget recorded executions, metrics and triggers
+
+        Background tasks keep running, so a long-lived manager (for example
+        one shared across tests) can be returned to a clean slate cheaply.
+        """
+        self.metrics_store.clear()
+        self.stats.clear()
+        self._recent_starts.clear()
+        self.trigger_configs.clear()
+        self._refresh_enabled_triggers()
+        self.queue.completed_workflows.clear()
 
     # Private methods
+    def _prepare_batch_data(
+        self,
+        batch_request: BatchWorkflowRequest,
+        batch_id: str
+    ) -> List[Tuple[WorkflowType, Dict[str, Any]]]:
+        """Build the input data for each workflow in a batch"""
+        shared_data = batch_request.shared_data
+        individual_data = batch_request.individual_data
+        batch_total = len(batch_request.workflows)
+        empty: Dict[str, Any] = {}
+
+        # Combine shared data, individual data and batch metadata in one
+        # dict build per workflow
+        return [
+            (workflow_type, {
+                **shared_data,
+                **individual_data.get(workflow_type, empty),
+                "batchId": batch_id,
+                "batchIndex": i,
+                "batchTotal": batch_total
+            })
+            for i, workflow_type in enumerate(batch_request.workflows)
+        ]
+
+    async def _execute_staggered(
+        self,
+        delay_seconds: float,
+        workflow_type: WorkflowType,
+        workflow_data: Dict[str, Any],
+        batch_id: str
+    ) -> WorkflowExecution:
+        """Execute a batch member after its start offset"""
+        if delay_seconds > 0:
+            await asyncio.sleep(delay_seconds)
+        return await self.execute_workflow(
+            workflow_type=workflow_type,
+            data=workflow_data,
+            correlation_id=batch_id
+        )
+
     async def _process_workflow_queue(self):
         """Background task to process the workflow queue"""
         while self._running:
             try:
+                # Sleep until a producer queues work, then until a slot is free
+                await self.queue.wait_for_workflow()
+                await self._concurrency.acquire()
+
                 # Get next workflow from queue
                 workflow = self.queue.get_next_workflow()
                 if not workflow:
-                    await asyncio.sleep(1)
+                    self._concurrency.release()
                     continue
 
-                # Mark as running
+                # Mark as running and execute alongside other workflows; the
+                # slot is released when the task finishes
                 self.queue.mark_running(workflow.execution_id)
+                task = asyncio.create_task(self._run_workflow(workflow))
+                self.automation_tasks.add(task)
+                task.add_done_callback(self.automation_tasks.discard)
+                task.add_done_callback(lambda _: self._concurrency.release())
 
-                # Execute workflow
-                try:
-                    result = await self.n8n_client.trigger_workflow(
-                        workflow_type=workflow.workflow_type,
-                        data=workflow.input_data,
-                        correlation_id=workflow.correlation_id
-                    )
-
-                    # Update the workflow execution with results
-                    workflow.status = result.status
-                    workflow.output_data = result.output_data
-                    workflow.error_message = result.error_message
-                    workflow.completed_at = result.completed_at
-                    workflow.duration_seconds = result.duration_seconds
-                    workflow.n8n_execution_id = result.n8n_execution_id
-
-                except Exception as e:
-                    workflow.status = WorkflowStatus.FAILED
-                    workflow.error_message = f"Execution failed: {str(e)}"
-                    workflow.completed_at = datetime.now()
-                    workflow.duration_seconds = (
-                        workflow.completed_at - workflow.started_at
-                    ).total_seconds()
-
-                # Mark as completed
-                self.queue.mark_completed(workflow)
-
-            except Exception as e:
-                print(f"Error in workflow queue processor: {e}")
+            except Exception:
+                logger.exception("Error in workflow queue processor")
                 await asyncio.sleep(5)
 
+    async def _run_workflow(self, workflow: WorkflowExecution):
+        """Trigger a queued workflow and record its result"""
+        try:
+            result = await self.n8n_client.trigger_workflow(
+                workflow_type=workflow.workflow_type,
+                data=workflow.input_data,
+                correlation_id=workflow.correlation_id
+            )
+
+            # Update the workflow execution with results
+            workflow.status = result.status
+            workflow.output_data = result.output_data
+            workflow.error_message = result.error_message
+            workflow.completed_at = result.completed_at
+            workflow.duration_seconds = result.duration_seconds
+            workflow.n8n_execution_id = result.n8n_execution_id
+
+        except Exception as e:
+            workflow.status = WorkflowStatus.FAILED
+            workflow.error_message = f"Execution failed: {str(e)}"
+            workflow.completed_at = datetime.now()
+            workflow.duration_seconds = time.monotonic() - workflow._started_monotonic
+
+        # Mark as completed
+        self.queue.mark_completed(workflow)
+
     async def _process_automated_triggers(self):
         """Background task to process automated triggers"""
         while self._running:
             try:
                 current_time = datetime.now()
 
-                # Process each trigger configuration
-                for trigger_config in self.trigger_configs.values():
-                    if not trigger_config.enabled:
-                        continue
-
+                # Process each enabled trigger configuration
+                for trigger_config in self._enabled_triggers:
                     # Check if trigger conditions are met
                     # This would be expanded based on specific trigger logic
                     if await self._should_trigger_workflow(trigger_config, current_time):
@@ -411,10 +585,19 @@ class WorkflowManager:
 
                 await asyncio.sleep(60)  # Check triggers every minute
 
-            except Exception as e:
-                print(f"Error in automated trigger processor: {e}")
+            except Exception:
+                logger.exception("Error in automated trigger processor")
                 await asyncio.sleep(60)
 
+    async def _process_cleanup(self):
+        """Background task to drop execution records past the retention period"""
+        while self._running:
+            await asyncio.sleep(3600)
+            try:
+                await self.cleanup_old_executions()
+            except Exception:
+                logger.exception("Error in execution cleanup")
+
     async def _should_trigger_workflow(
         self,
         trigger_config: WorkflowTriggerConfig,
@@ -427,12 +610,8 @@ class WorkflowManager:
         # In practice, this would evaluate complex trigger conditions
 
         # Check rate limiting
-        recent_executions = [
-            execution for execution in self.metrics_store.get(trigger_config.workflow_type, [])
-            if execution.started_at > current_time - timedelta(hours=1)
-        ]
-
-        if len(recent_executions) >= trigger_config.max_executions_per_hour:
+        recent_count = self._count_recent_executions(trigger_config.workflow_type, current_time)
+        if recent_count >= trigger_config.max_executions_per_hour:
             return False
 
         # Add more trigger condition logic here
@@ -440,16 +619,26 @@ class WorkflowManager:
 
         return False  # Default to not triggering
 
+    def _refresh_enabled_triggers(self):
+        """Rebuild the list of enabled triggers checked by the background task"""
+        self._enabled_triggers = [
+            trigger_config for trigger_config in self.trigger_configs.values()
+            if trigger_config.enabled
+        ]
+
+    def _count_recent_executions(self, workflow_type: WorkflowType, current_time: datetime) -> int:
+        """Count executions of a type started within the hour before current_time"""
+        recent = self._recent_starts[workflow_type]
+        _trim_before(recent, current_time - timedelta(hours=1))
+        return len(recent)
+
     def _update_metrics(self, execution: WorkflowExecution):
         """Update metrics store with execution data"""
         self.metrics_store[execution.workflow_type].append(execution)
+        self.stats[execution.workflow_type].record(execution)
 
-        # Keep only recent executions to prevent memory bloat
-        max_executions_per_type = 1000
-        if len(self.metrics_store[execution.workflow_type]) > max_executions_per_type:
-            # Remove oldest executions
-            self.metrics_store[execution.workflow_type] = sorted(
-                self.metrics_store[execution.workflow_type],
-                key=lambda e: e.started_at,
-                reverse=True
-            )[:max_executions_per_type]
\ No newline at end of file
+        # Executions are recorded when they finish, so start times can arrive
+        # out of order; keep the window sorted and trimmed to the last hour
+        recent = self._recent_starts[execution.workflow_type]
+        bisect.insort(recent, execution.started_at)
+        _trim_before(recent, datetime.now() - timedelta(hours=1))
\ No newline at end of file
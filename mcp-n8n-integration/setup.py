@@ -36,9 +36,13 @@ setup(
     install_requires=requirements,
     extras_require={
         "dev": [
-            "pytest>=7.0.0",
-            "pytest-asyncio>=0.21.0",
+            "pytest>=8.2.0",
+            "pytest-asyncio>=0.24.0",
             "pytest-mock>=3.10.0",
+            "pytest-xdist>=3.2.0",
+            "pytest-timeout>=2.1.0",
+            "respx>=0.20.0",
+            "winloop>=0.1.0; sys_platform == 'win32'",
             "pytest-cov>=4.0.0",
             "black>=23.0.0",
             "mypy>=1.0.0",
@@ -5,7 +5,16 @@ Pytest configuration and fixtures for Sanzo N8N MCP tests
 import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# uvloop is a faster drop-in event loop; winloop is its Windows port
+try:
+    import uvloop
+except ImportError:
+    try:
+        import winloop as uvloop
+    except ImportError:
+        uvloop = None
 
 from sanzo_n8n_mcp.models import WorkflowType, WorkflowStatus, WorkflowExecution
 from sanzo_n8n_mcp.n8n_client import N8NClient
@@ -13,30 +22,51 @@ from sanzo_n8n_mcp.workflow_manager import WorkflowManager
 from sanzo_n8n_mcp.server import SanzoN8NMCPServer
 
 
+def pytest_collection_modifyitems(config, items):
+    """Group tests by class so ``--dist=loadgroup`` keeps a class on one xdist worker"""
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+
+    for item in items:
+        if item.cls is not None:
+            item.add_marker(pytest.mark.xdist_group(item.cls.__name__))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def event_loop_policy():
+    """Run async tests on uvloop (or winloop) when it is installed"""
+    if uvloop is None:
+        yield asyncio.get_event_loop_policy()
+        return
+
+    policy = uvloop.EventLoopPolicy()
+    asyncio.set_event_loop_policy(policy)
+    yield policy
+    asyncio.set_event_loop_policy(None)
+
+
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def frozen_now():
+    """Fixed timestamp for test data, so mock records are deterministic"""
+    return datetime(2024, 1, 1, 12, 0, 0)
 
 
 @pytest.fixture
-async def mock_n8n_client():
-    """Mock N8N client for testing"""
-    client = AsyncMock(spec=N8NClient)
-
-    # Mock successful workflow execution
-    mock_execution = WorkflowExecution(
+def mock_execution(frozen_now):
+    """Completed execution returned by the mocks, built per test so changes cannot leak"""
+    return WorkflowExecution(
         execution_id="test_execution_123",
         workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
         status=WorkflowStatus.COMPLETED,
         input_data={"test": "data"},
-        started_at=datetime.now(),
-        completed_at=datetime.now(),
+        started_at=frozen_now,
+        completed_at=frozen_now + timedelta(seconds=1.5),
         duration_seconds=1.5
     )
 
+
+def _configure_mock_n8n_client(client, mock_execution):
+    """Give the mock client its default return values"""
     client.trigger_workflow.return_value = mock_execution
     client.get_workflow_execution.return_value = mock_execution
     client.list_workflow_executions.return_value = [mock_execution]
@@ -51,26 +81,27 @@ async def mock_n8n_client():
         queue_size=0
     )
 
-    return client
+
+@pytest.fixture(scope="session")
+def mock_n8n_client():
+    """Mock N8N client for testing (shared, configured and reset around each test)"""
+    return AsyncMock(spec=N8NClient)
+
+
+@pytest.fixture(autouse=True)
+def reset_mock_n8n_client(mock_n8n_client, mock_execution):
+    """Point the shared mock client at this test's execution, then drop per-test overrides"""
+    _configure_mock_n8n_client(mock_n8n_client, mock_execution)
+    yield
+    mock_n8n_client.reset_mock(return_value=True, side_effect=True)
 
 
 @pytest.fixture
-async def mock_workflow_manager(mock_n8n_client):
+def mock_workflow_manager(mock_n8n_client, mock_execution):
     """Mock workflow manager for testing"""
     manager = AsyncMock(spec=WorkflowManager)
     manager.n8n_client = mock_n8n_client
 
-    # Mock execution results
-    mock_execution = WorkflowExecution(
-        execution_id="test_execution_123",
-        workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-        status=WorkflowStatus.COMPLETED,
-        input_data={"test": "data"},
-        started_at=datetime.now(),
-        completed_at=datetime.now(),
-        duration_seconds=1.5
-    )
-
     manager.execute_workflow.return_value = mock_execution
     manager.get_workflow_metrics.return_value = MagicMock(
         total_executions=10,
@@ -88,7 +119,7 @@ async def mock_workflow_manager(mock_n8n_client):
 
 
 @pytest.fixture
-async def mcp_server(mock_workflow_manager, mock_n8n_client):
+def mcp_server(mock_workflow_manager, mock_n8n_client):
     """Mock MCP server for testing"""
     server = SanzoN8NMCPServer()
     server.workflow_manager = mock_workflow_manager
@@ -96,9 +127,9 @@ async def mcp_server(mock_workflow_manager, mock_n8n_client):
     return server
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_workflow_data():
-    """Sample workflow input data for testing"""
+    """Sample workflow input data for testing (shared, treat as read-only)"""
     return {
         "customer_analysis": {
             "analysisType": "photo",
@@ -128,9 +159,9 @@ def sample_workflow_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_batch_request():
-    """Sample batch workflow request for testing"""
+    """Sample batch workflow request for testing (shared, treat as read-only)"""
     return {
         "workflows": [
             WorkflowType.CUSTOMER_ANALYSIS,
@@ -152,9 +183,9 @@ def sample_batch_request():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_n8n_responses():
-    """Mock N8N API responses for testing"""
+    """Mock N8N API responses for testing (shared, treat as read-only)"""
     return {
         "health_check": {
             "status": "ok",
@@ -176,9 +207,9 @@ def mock_n8n_responses():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def webhook_payloads():
-    """Sample webhook payloads for testing"""
+    """Sample webhook payloads for testing (shared, treat as read-only)"""
     return {
         "customer_analysis": {
             "analysisType": "photo",
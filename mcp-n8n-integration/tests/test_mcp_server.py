@@ -4,10 +4,14 @@ Tests for MCP Server functionality
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
-
-from sanzo_n8n_mcp.server import SanzoN8NMCPServer
+import os
+import signal
+import time
+from unittest.mock import AsyncMock, MagicMock, call, patch, sentinel
+
+from sanzo_n8n_mcp.server import SanzoN8NMCPServer, ServerConfig, main
+from sanzo_n8n_mcp.n8n_client import N8NClient
+from sanzo_n8n_mcp.workflow_manager import WorkflowManager
 from sanzo_n8n_mcp.models import (
     WorkflowType,
     WorkflowStatus,
@@ -16,30 +20,136 @@ from sanzo_n8n_mcp.models import (
 )
 
 
+EXPECTED_TOOLS = frozenset({
+    "execute_workflow",
+    "execute_batch_workflows",
+    "get_workflow_status",
+    "list_workflow_executions",
+    "get_workflow_metrics",
+    "health_check",
+    "cancel_workflow",
+    "trigger_customer_analysis",
+    "trigger_photo_analysis_processing",
+    "trigger_crm_lead_management",
+    "trigger_follow_up_sequences",
+    "get_queue_status",
+    "add_automated_trigger",
+    "list_automated_triggers",
+    "remove_automated_trigger"
+})
+
+# (tool, dependency attribute, dependency method, tool kwargs, expected dependency call)
+DISPATCH_CASES = [
+    ("get_workflow_status", "n8n_client", "get_workflow_execution",
+     {"execution_id": "test_123"}, call("test_123")),
+    ("get_workflow_metrics", "workflow_manager", "get_workflow_metrics",
+     {"workflow_type": WorkflowType.CUSTOMER_ANALYSIS}, call(WorkflowType.CUSTOMER_ANALYSIS)),
+    ("health_check", "n8n_client", "health_check", {}, call()),
+    ("cancel_workflow", "n8n_client", "cancel_workflow_execution",
+     {"execution_id": "test_123"}, call("test_123")),
+    ("get_queue_status", "workflow_manager", "get_queue_status", {}, call()),
+    ("list_automated_triggers", "workflow_manager", "list_automated_triggers", {}, call()),
+    ("remove_automated_trigger", "workflow_manager", "remove_automated_trigger",
+     {"trigger_name": "test_trigger"}, call("test_trigger")),
+]
+
+
+# (tool, tool kwargs, workflow type, expected subset of the workflow payload)
+TRIGGER_CASES = [
+    ("trigger_customer_analysis", {
+        "analysis_type": "photo",
+        "room_type": "living_room",
+        "customer_email": "test@example.com",
+        "customer_name": "Test Customer",
+        "age_group": "25-35",
+        "additional_data": {"preference": "modern"}
+    }, WorkflowType.CUSTOMER_ANALYSIS, {
+        "analysisType": "photo",
+        "roomType": "living_room",
+        "customerEmail": "test@example.com",
+        "preference": "modern"
+    }),
+    ("trigger_photo_analysis_processing", {
+        "extracted_colors": ["#FF5733", "#33FF57"],
+        "room_context": {"room_type": "bedroom"},
+        "recommendations": [{"color": "#FF5733", "usage": "accent"}],
+        "confidence": 0.9,
+        "metadata": {"camera": "iPhone"}
+    }, WorkflowType.PHOTO_ANALYSIS_PROCESSING, {
+        "extractedColors": ["#FF5733", "#33FF57"],
+        "confidence": 0.9
+    }),
+    ("trigger_crm_lead_management", {
+        "customer_name": "Test Customer",
+        "customer_email": "test@example.com",
+        "analysis_data": {"colors": ["#FF5733"]},
+        "room_type": "kitchen",
+        "analysis_type": "preferences",
+        "customer_phone": None,
+        "lead_source": "sanzo-color-advisor"
+    }, WorkflowType.CRM_LEAD_MANAGEMENT, {
+        "customerEmail": "test@example.com",
+        "analysisData": {"colors": ["#FF5733"]},
+        "leadSource": "sanzo-color-advisor"
+    }),
+    ("trigger_follow_up_sequences", {
+        "follow_up_type": "personal",
+        "customer_data": {"email": "test@example.com"},
+        "lead_score": 75,
+        "follow_up_action": "email",
+        "delay_hours": 24
+    }, WorkflowType.FOLLOW_UP_SEQUENCES, {
+        "followUpType": "personal",
+        "leadScore": 75,
+        "delayHours": 24
+    }),
+]
+
+
 class TestSanzoN8NMCPServer:
     """Test suite for SanzoN8NMCPServer"""
 
-    @pytest.fixture
-    async def mcp_server_initialized(self, mock_workflow_manager, mock_n8n_client):
-        """Create and initialize MCP server for testing"""
+    @pytest.fixture(scope="class")
+    def mcp_server_initialized(self):
+        """MCP server wired to mock dependencies, built once for the class"""
         server = SanzoN8NMCPServer()
-        server.workflow_manager = mock_workflow_manager
-        server.n8n_client = mock_n8n_client
+        server.workflow_manager = AsyncMock(spec=WorkflowManager)
+        server.n8n_client = AsyncMock(spec=N8NClient)
         return server
 
-    @pytest.mark.asyncio
-    async def test_server_initialization(self):
+    @pytest.fixture(scope="class")
+    def uninitialized_server(self):
+        """Server that was never initialized, shared by the read-only checks"""
+        return SanzoN8NMCPServer()
+
+    @pytest.fixture(scope="class")
+    def tools_by_name(self, mcp_server_initialized):
+        """Registered tools of the shared server, keyed by name"""
+        return mcp_server_initialized.tools_by_name
+
+    @pytest.fixture(autouse=True)
+    def reset_server_mocks(self, mcp_server_initialized):
+        """Clear calls, return values and side effects left by earlier tests"""
+        server = mcp_server_initialized
+        server.workflow_manager.reset_mock(return_value=True, side_effect=True)
+        server.n8n_client.reset_mock(return_value=True, side_effect=True)
+        server._response_cache.clear()
+
+    async def test_server_initialization(self, uninitialized_server):
         """Test MCP server initialization"""
-        server = SanzoN8NMCPServer()
+        server = uninitialized_server
         assert server.mcp is not None
+        assert server.config is None
         assert server.n8n_client is None
         assert server.workflow_manager is None
 
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     @patch('sanzo_n8n_mcp.server.N8NClient')
     @patch('sanzo_n8n_mcp.server.WorkflowManager')
     async def test_initialize_with_environment(self, mock_workflow_manager_class, mock_n8n_client_class):
         """Test server initialization with environment variables"""
+        mock_workflow_manager_class.return_value.start = AsyncMock()
+
         with patch.dict('os.environ', {
             'N8N_BASE_URL': 'http://test:5678',
             'N8N_API_KEY': 'test_key',
@@ -48,30 +158,55 @@ class TestSanzoN8NMCPServer:
             server = SanzoN8NMCPServer()
             await server.initialize()
 
-            # Check that N8N client was created with correct parameters
-            mock_n8n_client_class.assert_called_once_with(
+            # Check that N8N client was created from the environment config
+            expected_config = ServerConfig(
                 n8n_base_url='http://test:5678',
-                webhook_base_url='http://localhost:5678/webhook',
                 webhook_server_url='http://test:3003',
-                api_key='test_key'
+                n8n_api_key='test_key'
             )
+            assert server.config == expected_config
+            mock_n8n_client_class.from_config.assert_called_once_with(expected_config)
 
             # Check that workflow manager was created and started
             mock_workflow_manager_class.assert_called_once()
             server.workflow_manager.start.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_cleanup(self, mcp_server_initialized):
-        """Test server cleanup"""
-        server = mcp_server_initialized
+    async def test_config_from_env_keeps_defaults(self):
+        """Test unset environment variables fall back to the ServerConfig defaults"""
+        with patch.dict('os.environ', {'N8N_API_KEY': 'test_key'}, clear=True):
+            config = ServerConfig.from_env()
 
-        await server.cleanup()
+        assert config == ServerConfig(n8n_api_key='test_key')
+        assert config.n8n_base_url == "http://localhost:5678"
+
+    async def test_cleanup(self, mcp_server, mock_workflow_manager, mock_n8n_client):
+        """Test server cleanup"""
+        await mcp_server.cleanup()
+
+        mock_workflow_manager.stop.assert_called_once()
+        mock_n8n_client.close.assert_called_once()
+        assert mcp_server.workflow_manager is None
+        assert mcp_server.n8n_client is None
+
+    @pytest.mark.parametrize("tool_name,kwargs,message", [
+        ("get_queue_status", {}, "Workflow manager not initialized"),
+        ("cancel_workflow", {"execution_id": "exec_123"}, "N8N client not initialized"),
+    ])
+    async def test_tools_not_initialized(self, uninitialized_server, tool_name, kwargs, message):
+        """Test tools fail clearly when the server has no dependencies"""
+        with pytest.raises(RuntimeError, match=message):
+            await uninitialized_server.tools_by_name[tool_name](**kwargs)
+
+    async def test_tools_after_cleanup(self, mcp_server):
+        """Test tools fail clearly once the server has been cleaned up"""
+        await mcp_server.cleanup()
 
-        server.workflow_manager.stop.assert_called_once()
-        server.n8n_client.close.assert_called_once()
+        with pytest.raises(RuntimeError, match="Workflow manager not initialized"):
+            await mcp_server.tools_by_name["get_queue_status"]()
 
-    @pytest.mark.asyncio
-    async def test_execute_workflow_tool(self, mcp_server_initialized, sample_workflow_data):
+    async def test_execute_workflow_tool(
+        self, mcp_server_initialized, tools_by_name, sample_workflow_data, frozen_now
+    ):
         """Test execute_workflow MCP tool"""
         server = mcp_server_initialized
 
@@ -81,16 +216,15 @@ class TestSanzoN8NMCPServer:
             workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
             status=WorkflowStatus.COMPLETED,
             input_data=sample_workflow_data["customer_analysis"],
-            started_at=datetime.now()
+            started_at=frozen_now
         )
         server.workflow_manager.execute_workflow.return_value = mock_execution
 
         # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        execute_tool = tools["execute_workflow"]
+        execute_tool = tools_by_name["execute_workflow"]
 
         # Execute the tool
-        result = await execute_tool.func(
+        result = await execute_tool(
             workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
             data=sample_workflow_data["customer_analysis"],
             priority=7,
@@ -107,22 +241,11 @@ class TestSanzoN8NMCPServer:
             timeout_override=None
         )
 
-    @pytest.mark.asyncio
-    async def test_execute_workflow_tool_not_initialized(self):
-        """Test execute_workflow tool when manager not initialized"""
-        server = SanzoN8NMCPServer()
-
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        execute_tool = tools["execute_workflow"]
+    async def test_tools_registered_before_initialize(self, uninitialized_server):
+        """Test tools are available as soon as the server is constructed"""
+        assert uninitialized_server.tools_by_name.keys() == EXPECTED_TOOLS
 
-        with pytest.raises(RuntimeError, match="Workflow manager not initialized"):
-            await execute_tool.func(
-                workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-                data={"test": "data"}
-            )
-
-    @pytest.mark.asyncio
-    async def test_execute_batch_workflows_tool(self, mcp_server_initialized):
+    async def test_execute_batch_workflows_tool(self, mcp_server_initialized, tools_by_name, frozen_now):
         """Test execute_batch_workflows MCP tool"""
         server = mcp_server_initialized
 
@@ -133,16 +256,15 @@ class TestSanzoN8NMCPServer:
             successful_workflows=2,
             failed_workflows=0,
             execution_results=[],
-            started_at=datetime.now()
+            started_at=frozen_now
         )
         server.workflow_manager.execute_batch_workflows.return_value = mock_result
 
         # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        batch_tool = tools["execute_batch_workflows"]
+        batch_tool = tools_by_name["execute_batch_workflows"]
 
         # Execute the tool
-        result = await batch_tool.func(
+        result = await batch_tool(
             workflows=[WorkflowType.CUSTOMER_ANALYSIS, WorkflowType.CRM_LEAD_MANAGEMENT],
             shared_data={"source": "test"},
             individual_data={
@@ -157,235 +279,160 @@ class TestSanzoN8NMCPServer:
         assert result == mock_result
         server.workflow_manager.execute_batch_workflows.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_get_workflow_status_tool(self, mcp_server_initialized):
-        """Test get_workflow_status MCP tool"""
-        server = mcp_server_initialized
-
-        # Mock execution
-        mock_execution = WorkflowExecution(
-            execution_id="test_123",
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            status=WorkflowStatus.COMPLETED,
-            input_data={},
-            started_at=datetime.now()
-        )
-        server.n8n_client.get_workflow_execution.return_value = mock_execution
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        status_tool = tools["get_workflow_status"]
-
-        # Execute the tool
-        result = await status_tool.func(execution_id="test_123")
-
-        # Assertions
-        assert result == mock_execution
-        server.n8n_client.get_workflow_execution.assert_called_once_with("test_123")
-
-    @pytest.mark.asyncio
-    async def test_list_workflow_executions_tool(self, mcp_server_initialized):
-        """Test list_workflow_executions MCP tool"""
+    @pytest.mark.parametrize(
+        "tool_name,target,method,kwargs,expected_call",
+        DISPATCH_CASES,
+        ids=[case[0] for case in DISPATCH_CASES]
+    )
+    async def test_tool_dispatch(
+        self, mcp_server_initialized, tools_by_name, tool_name, target, method, kwargs, expected_call
+    ):
+        """Test read and control tools hand straight through to the manager or client"""
+        mocked = getattr(getattr(mcp_server_initialized, target), method)
+        mocked.return_value = sentinel.result
+
+        result = await tools_by_name[tool_name](**kwargs)
+
+        assert result is sentinel.result
+        mocked.assert_called_once()
+        assert mocked.call_args == expected_call
+
+    async def test_list_workflow_executions_tool(self, mcp_server_initialized, tools_by_name, mock_execution):
+        """Test list_workflow_executions passes filters to the client and returns its executions"""
         server = mcp_server_initialized
+        server.n8n_client.list_workflow_executions.return_value = [mock_execution]
 
-        # Mock executions list
-        mock_executions = [
-            WorkflowExecution(
-                execution_id="test_1",
-                workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-                status=WorkflowStatus.COMPLETED,
-                input_data={},
-                started_at=datetime.now()
-            )
-        ]
-        server.n8n_client.list_workflow_executions.return_value = mock_executions
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        list_tool = tools["list_workflow_executions"]
-
-        # Execute the tool
-        result = await list_tool.func(
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            status=WorkflowStatus.COMPLETED,
-            limit=10
+        result = await tools_by_name["list_workflow_executions"](
+            workflow_type=WorkflowType.CUSTOMER_ANALYSIS, status=WorkflowStatus.COMPLETED, limit=10
         )
 
-        # Assertions
-        assert result == mock_executions
-        server.n8n_client.list_workflow_executions.assert_called_once_with(
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            status=WorkflowStatus.COMPLETED,
-            limit=10
+        assert result == [mock_execution]
+        server.n8n_client.list_workflow_executions.assert_awaited_once_with(
+            workflow_type=WorkflowType.CUSTOMER_ANALYSIS, status=WorkflowStatus.COMPLETED, limit=10
         )
 
-    @pytest.mark.asyncio
-    async def test_get_workflow_metrics_tool(self, mcp_server_initialized):
-        """Test get_workflow_metrics MCP tool"""
-        server = mcp_server_initialized
-
-        # Mock metrics
-        mock_metrics = MagicMock()
-        mock_metrics.workflow_type = WorkflowType.CUSTOMER_ANALYSIS
-        mock_metrics.success_rate = 95.0
-        server.workflow_manager.get_workflow_metrics.return_value = mock_metrics
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        metrics_tool = tools["get_workflow_metrics"]
-
-        # Execute the tool
-        result = await metrics_tool.func(workflow_type=WorkflowType.CUSTOMER_ANALYSIS)
-
-        # Assertions
-        assert result == mock_metrics
-        server.workflow_manager.get_workflow_metrics.assert_called_once_with(
-            WorkflowType.CUSTOMER_ANALYSIS
-        )
-
-    @pytest.mark.asyncio
-    async def test_health_check_tool(self, mcp_server_initialized):
-        """Test health_check MCP tool"""
-        server = mcp_server_initialized
-
-        # Mock health check result
-        mock_health = MagicMock()
-        mock_health.status = "healthy"
-        server.n8n_client.health_check.return_value = mock_health
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        health_tool = tools["health_check"]
-
-        # Execute the tool
-        result = await health_tool.func()
-
-        # Assertions
-        assert result == mock_health
-        server.n8n_client.health_check.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_cancel_workflow_tool(self, mcp_server_initialized):
-        """Test cancel_workflow MCP tool"""
-        server = mcp_server_initialized
-
-        # Mock cancellation success
-        server.n8n_client.cancel_workflow_execution.return_value = True
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        cancel_tool = tools["cancel_workflow"]
-
-        # Execute the tool
-        result = await cancel_tool.func(execution_id="test_123")
-
-        # Assertions
-        assert result is True
-        server.n8n_client.cancel_workflow_execution.assert_called_once_with("test_123")
-
-    @pytest.mark.asyncio
-    async def test_trigger_customer_analysis_tool(self, mcp_server_initialized):
-        """Test trigger_customer_analysis convenience tool"""
-        server = mcp_server_initialized
-
-        # Mock execution
-        mock_execution = WorkflowExecution(
-            execution_id="quick_analysis_123",
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            status=WorkflowStatus.COMPLETED,
-            input_data={},
-            started_at=datetime.now()
+    async def test_cached_executions(self, mock_execution):
+        """Test execution listings are reused within the TTL"""
+        server = SanzoN8NMCPServer(response_cache_size=2)
+        first, second = (
+            [mock_execution.model_copy(update={"execution_id": execution_id})]
+            for execution_id in ("first", "second")
         )
-        server.workflow_manager.execute_workflow.return_value = mock_execution
+        fetch = AsyncMock(side_effect=[first, second, [], []])
 
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        analysis_tool = tools["trigger_customer_analysis"]
+        assert await server._cached_executions(("a",), fetch) == first
+        assert await server._cached_executions(("a",), fetch) == first
+        assert fetch.call_count == 1
 
-        # Execute the tool
-        result = await analysis_tool.func(
-            analysis_type="photo",
-            room_type="living_room",
-            customer_email="test@example.com",
-            customer_name="Test Customer",
-            age_group="25-35",
-            additional_data={"preference": "modern"}
-        )
+        # Expired entries are refetched
+        server.response_cache_ttl = 0
+        assert await server._cached_executions(("a",), fetch) == second
 
-        # Assertions
-        assert result == mock_execution
+        # Oldest entry is evicted once the cache is full
+        server.response_cache_ttl = 60
+        await server._cached_executions(("b",), fetch)
+        await server._cached_executions(("c",), fetch)
+        assert list(server._response_cache) == [("b",), ("c",)]
 
-        # Check that workflow was called with correct data
-        call_args = server.workflow_manager.execute_workflow.call_args
-        assert call_args[1]['workflow_type'] == WorkflowType.CUSTOMER_ANALYSIS
-        assert call_args[1]['data']['analysisType'] == "photo"
-        assert call_args[1]['data']['roomType'] == "living_room"
-        assert call_args[1]['data']['customerEmail'] == "test@example.com"
-        assert call_args[1]['data']['preference'] == "modern"
-
-    @pytest.mark.asyncio
-    async def test_trigger_photo_analysis_processing_tool(self, mcp_server_initialized):
-        """Test trigger_photo_analysis_processing tool"""
+    async def test_cached_executions_returns_copies(self, mock_execution):
+        """Test callers cannot modify cached executions in place"""
+        server = SanzoN8NMCPServer()
+        fetch = AsyncMock(return_value=[mock_execution])
+
+        first = await server._cached_executions(("a",), fetch)
+        first[0].status = WorkflowStatus.CANCELLED
+        first.clear()
+
+        assert await server._cached_executions(("a",), fetch) == [mock_execution]
+        assert mock_execution.status == WorkflowStatus.COMPLETED
+        assert fetch.call_count == 1
+
+    async def test_cached_executions_keeps_fresher_entry(self, mock_execution):
+        """Test a slow fetch does not replace a listing fetched after it started"""
+        server = SanzoN8NMCPServer(response_cache_ttl=0)
+        release = asyncio.Event()
+        stale = [mock_execution.model_copy(update={"status": WorkflowStatus.RUNNING})]
+
+        async def slow_fetch():
+            await release.wait()
+            return stale
+
+        slow = asyncio.create_task(server._cached_executions(("a",), slow_fetch))
+        await asyncio.sleep(0)
+        server.response_cache_ttl = 60
+        fresh_fetch = AsyncMock(return_value=[mock_execution])
+        assert await server._cached_executions(("a",), fresh_fetch) == [mock_execution]
+
+        release.set()
+        assert await slow == stale
+        assert server._response_cache[("a",)][1] == (mock_execution,)
+
+    async def test_execution_tools_invalidate_cached_executions(self, mcp_server, mock_execution):
+        """Test cancelling a workflow drops cached listings and in-flight fetches"""
+        release = asyncio.Event()
+
+        async def slow_fetch():
+            await release.wait()
+            return [mock_execution]
+
+        in_flight = asyncio.create_task(mcp_server._cached_executions((None, None, 10), slow_fetch))
+        await asyncio.sleep(0)
+        mcp_server._response_cache[(None, None, 20)] = (time.monotonic(), (mock_execution,))
+
+        await mcp_server.tools_by_name["cancel_workflow"](execution_id="exec_123")
+        assert mcp_server._response_cache == {}
+
+        release.set()
+        await in_flight
+        assert mcp_server._response_cache == {}
+
+    async def test_reset_state(self, mcp_server):
+        """Test reset clears manager state and cached responses"""
+        mcp_server._response_cache[("a",)] = (0.0, "cached")
+
+        await mcp_server.reset_state()
+
+        mcp_server.workflow_manager.reset_state.assert_awaited_once()
+        mcp_server.n8n_client.clear_health_cache.assert_called_once()
+        assert mcp_server._response_cache == {}
+
+    async def test_tools_use_current_dependencies(self, mcp_server):
+        """Test tools call the server's current manager after it is replaced"""
+        replacement = AsyncMock(spec=WorkflowManager)
+        replacement.get_queue_status.return_value = {"queue_size": 3}
+
+        # Re-initializing swaps the dependencies behind the registered tools
+        mcp_server.workflow_manager = replacement
+
+        result = await mcp_server.tools_by_name["get_queue_status"]()
+
+        assert result == {"queue_size": 3}
+        replacement.get_queue_status.assert_awaited_once()
+
+    @pytest.mark.parametrize(
+        "tool_name,kwargs,expected_type,expected_data",
+        TRIGGER_CASES,
+        ids=[case[0] for case in TRIGGER_CASES]
+    )
+    async def test_trigger_tool(
+        self, mcp_server_initialized, tools_by_name, tool_name, kwargs, expected_type, expected_data
+    ):
+        """Test convenience trigger tools build the workflow payload"""
         server = mcp_server_initialized
+        server.workflow_manager.execute_workflow.return_value = sentinel.execution
 
-        # Mock execution
-        mock_execution = WorkflowExecution(
-            execution_id="photo_analysis_123",
-            workflow_type=WorkflowType.PHOTO_ANALYSIS_PROCESSING,
-            status=WorkflowStatus.COMPLETED,
-            input_data={},
-            started_at=datetime.now()
-        )
-        server.workflow_manager.execute_workflow.return_value = mock_execution
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        photo_tool = tools["trigger_photo_analysis_processing"]
-
-        # Execute the tool
-        result = await photo_tool.func(
-            extracted_colors=["#FF5733", "#33FF57"],
-            room_context={"room_type": "bedroom"},
-            recommendations=[{"color": "#FF5733", "usage": "accent"}],
-            confidence=0.9,
-            metadata={"camera": "iPhone"}
-        )
+        result = await tools_by_name[tool_name](**kwargs)
 
         # Assertions
-        assert result == mock_execution
+        assert result is sentinel.execution
 
         # Check that workflow was called with correct data
         call_args = server.workflow_manager.execute_workflow.call_args
-        assert call_args[1]['workflow_type'] == WorkflowType.PHOTO_ANALYSIS_PROCESSING
-        assert call_args[1]['data']['extractedColors'] == ["#FF5733", "#33FF57"]
-        assert call_args[1]['data']['confidence'] == 0.9
-
-    @pytest.mark.asyncio
-    async def test_get_queue_status_tool(self, mcp_server_initialized):
-        """Test get_queue_status tool"""
-        server = mcp_server_initialized
+        assert call_args[1]['workflow_type'] == expected_type
+        for key, value in expected_data.items():
+            assert call_args[1]['data'][key] == value
 
-        # Mock queue status
-        mock_status = {
-            "queue_size": 5,
-            "running_workflows": 2,
-            "completed_workflows": 100
-        }
-        server.workflow_manager.get_queue_status.return_value = mock_status
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        queue_tool = tools["get_queue_status"]
-
-        # Execute the tool
-        result = await queue_tool.func()
-
-        # Assertions
-        assert result == mock_status
-        server.workflow_manager.get_queue_status.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_add_automated_trigger_tool(self, mcp_server_initialized):
+    async def test_add_automated_trigger_tool(self, mcp_server_initialized, tools_by_name):
         """Test add_automated_trigger tool"""
         server = mcp_server_initialized
 
@@ -393,11 +440,10 @@ class TestSanzoN8NMCPServer:
         server.workflow_manager.add_automated_trigger.return_value = None
 
         # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        trigger_tool = tools["add_automated_trigger"]
+        trigger_tool = tools_by_name["add_automated_trigger"]
 
         # Execute the tool
-        result = await trigger_tool.func(
+        result = await trigger_tool(
             trigger_name="test_trigger",
             workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
             trigger_conditions={"condition": "value"},
@@ -409,102 +455,56 @@ class TestSanzoN8NMCPServer:
         assert result is True
         server.workflow_manager.add_automated_trigger.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_list_automated_triggers_tool(self, mcp_server_initialized):
-        """Test list_automated_triggers tool"""
+    async def test_get_server(self, mcp_server_initialized):
+        """Test get_server method"""
         server = mcp_server_initialized
+        mcp_instance = server.get_server()
 
-        # Mock triggers list
-        mock_triggers = [MagicMock(), MagicMock()]
-        server.workflow_manager.list_automated_triggers.return_value = mock_triggers
-
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        list_triggers_tool = tools["list_automated_triggers"]
-
-        # Execute the tool
-        result = await list_triggers_tool.func()
-
-        # Assertions
-        assert result == mock_triggers
-        server.workflow_manager.list_automated_triggers.assert_called_once()
+        assert mcp_instance == server.mcp
 
-    @pytest.mark.asyncio
-    async def test_remove_automated_trigger_tool(self, mcp_server_initialized):
-        """Test remove_automated_trigger tool"""
-        server = mcp_server_initialized
+    async def test_main_cleans_up_on_shutdown_signal(self):
+        """Test main() stops serving and cleans up when SIGTERM arrives"""
+        server = MagicMock(spec=SanzoN8NMCPServer)
+        served = []
 
-        # Mock successful removal
-        server.workflow_manager.remove_automated_trigger.return_value = True
+        async def serve_until_signalled():
+            served.append(True)
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.Event().wait()
 
-        # Get the tool function
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        remove_trigger_tool = tools["remove_automated_trigger"]
+        server.get_server.return_value.run_stdio_async = serve_until_signalled
 
-        # Execute the tool
-        result = await remove_trigger_tool.func(trigger_name="test_trigger")
+        with patch('sanzo_n8n_mcp.server.create_server', AsyncMock(return_value=server)):
+            await asyncio.wait_for(main(), timeout=5)
 
-        # Assertions
-        assert result is True
-        server.workflow_manager.remove_automated_trigger.assert_called_once_with("test_trigger")
+        assert served == [True]
+        server.cleanup.assert_awaited_once()
 
-    @pytest.mark.asyncio
-    async def test_get_server(self, mcp_server_initialized):
-        """Test get_server method"""
-        server = mcp_server_initialized
-        mcp_instance = server.get_server()
+    async def test_all_tools_registered(self, mcp_server_initialized, tools_by_name):
+        """Test that all expected tools are registered with FastMCP and indexed"""
+        registered = {tool.name for tool in await mcp_server_initialized.mcp.list_tools()}
 
-        assert mcp_instance == server.mcp
+        assert registered == EXPECTED_TOOLS
+        assert tools_by_name.keys() == EXPECTED_TOOLS
 
-    @pytest.mark.asyncio
-    async def test_all_tools_registered(self, mcp_server_initialized):
-        """Test that all expected tools are registered"""
-        server = mcp_server_initialized
-        tool_names = {tool.name for tool in server.mcp.tools}
-
-        expected_tools = {
-            "execute_workflow",
-            "execute_batch_workflows",
-            "get_workflow_status",
-            "list_workflow_executions",
-            "get_workflow_metrics",
-            "health_check",
-            "cancel_workflow",
-            "trigger_customer_analysis",
-            "trigger_photo_analysis_processing",
-            "trigger_crm_lead_management",
-            "trigger_follow_up_sequences",
-            "get_queue_status",
-            "add_automated_trigger",
-            "list_automated_triggers",
-            "remove_automated_trigger"
-        }
-
-        assert tool_names == expected_tools
-
-    @pytest.mark.asyncio
     async def test_tool_descriptions_present(self, mcp_server_initialized):
         """Test that all tools have descriptions"""
-        server = mcp_server_initialized
-
-        for tool in server.mcp.tools:
-            assert tool.description is not None
-            assert len(tool.description) > 0
+        tools = await mcp_server_initialized.mcp.list_tools()
+        missing = [tool.name for tool in tools if not tool.description]
+        assert missing == []
 
-    @pytest.mark.asyncio
-    async def test_error_handling_in_tools(self, mcp_server_initialized):
+    async def test_error_handling_in_tools(self, mcp_server_initialized, tools_by_name):
         """Test error handling in tools when dependencies fail"""
         server = mcp_server_initialized
 
         # Make workflow manager raise an exception
         server.workflow_manager.execute_workflow.side_effect = Exception("Test error")
 
-        tools = {tool.name: tool for tool in server.mcp.tools}
-        execute_tool = tools["execute_workflow"]
+        execute_tool = tools_by_name["execute_workflow"]
 
         # Should propagate the exception
         with pytest.raises(Exception, match="Test error"):
-            await execute_tool.func(
+            await execute_tool(
                 workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
                 data={"test": "data"}
             )
\ No newline at end of file
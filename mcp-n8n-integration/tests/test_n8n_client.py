@@ -3,20 +3,44 @@ Tests for N8N Client functionality
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
+import httpx
+import orjson
+import respx
 from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime
 
 from sanzo_n8n_mcp.n8n_client import N8NClient, N8NAPIError, N8NConnectionError
+from sanzo_n8n_mcp.server import ServerConfig
 from sanzo_n8n_mcp.models import WorkflowType, WorkflowStatus, WorkflowHealthCheck
 
 
+# Webhook proxy endpoint the shared client posts customer analysis triggers to
+CUSTOMER_ANALYSIS_ENDPOINT = "http://localhost:3003/api/webhooks/customer-analysis"
+
+# Response bodies serialized once at import (treat as read-only)
+JSON_HEADERS = {"content-type": "application/json"}
+TRIGGER_SUCCESS_JSON = orjson.dumps({"success": True, "workflowId": "test_workflow_123"})
+NO_EXECUTIONS_JSON = orjson.dumps({"data": []})
+LIST_EXECUTIONS_JSON = orjson.dumps({
+    "data": [
+        {
+            "id": "execution_1",
+            "status": "success",
+            "data": {"test": "data"}
+        }
+    ]
+})
+
+
+@pytest.mark.asyncio(loop_scope="class")
 class TestN8NClient:
     """Test suite for N8NClient"""
 
-    @pytest.fixture
+    @pytest_asyncio.fixture(scope="class", loop_scope="class")
     async def n8n_client(self):
-        """Create N8N client for testing"""
+        """One N8N client shared by the class, so its connection pool outlives each test"""
         client = N8NClient(
             n8n_base_url="http://localhost:5678",
             webhook_base_url="http://localhost:5678/webhook",
@@ -25,7 +49,36 @@ class TestN8NClient:
         yield client
         await client.close()
 
-    @pytest.mark.asyncio
+    @pytest.fixture(scope="class")
+    def router(self, n8n_client):
+        """respx router answering the shared client's endpoints as healthy, built once"""
+        router = respx.mock(assert_all_called=False)
+        router.post(CUSTOMER_ANALYSIS_ENDPOINT, name="trigger").respond(
+            200, content=TRIGGER_SUCCESS_JSON, headers=JSON_HEADERS
+        )
+        for name, url in n8n_client._probe_urls.items():
+            router.get(url, name=name).respond(200)
+        router.get(n8n_client._executions_url, name="executions").respond(
+            200, content=NO_EXECUTIONS_JSON, headers=JSON_HEADERS
+        )
+        return router
+
+    @pytest.fixture(autouse=True)
+    def mocked_transport(self, router):
+        """Route each test's requests through the router, rolling back its overrides after"""
+        with router:
+            yield router
+
+    @pytest.fixture(autouse=True)
+    def restore_client_state(self, n8n_client):
+        """Undo per-test changes to the shared client's configs and health cache"""
+        workflow_configs = dict(n8n_client.workflow_configs)
+        health_cache_ttl = n8n_client.health_cache_ttl
+        yield
+        n8n_client.workflow_configs = workflow_configs
+        n8n_client.health_cache_ttl = health_cache_ttl
+        n8n_client.clear_health_cache()
+
     async def test_client_initialization(self):
         """Test N8N client initialization"""
         client = N8NClient(
@@ -40,7 +93,21 @@ class TestN8NClient:
 
         await client.close()
 
-    @pytest.mark.asyncio
+    async def test_client_from_config(self):
+        """Test the client takes its connection settings from a ServerConfig"""
+        config = ServerConfig(
+            n8n_base_url="http://test:5678/",
+            webhook_server_url="http://test:3003",
+            n8n_api_key="test_key"
+        )
+
+        async with N8NClient.from_config(config, timeout=5) as client:
+            assert client.n8n_base_url == "http://test:5678"
+            assert client.webhook_base_url == "http://localhost:5678/webhook"
+            assert client.webhook_server_url == "http://test:3003"
+            assert client.api_key == "test_key"
+            assert client.timeout == 5
+
     async def test_workflow_configurations(self, n8n_client):
         """Test workflow configurations are properly set"""
         configs = n8n_client.workflow_configs
@@ -56,18 +123,9 @@ class TestN8NClient:
         assert "customer-analysis-trigger" in customer_config.webhook_url
         assert "analysisType" in customer_config.expected_fields
 
-    @pytest.mark.asyncio
-    @patch('httpx.AsyncClient.post')
-    async def test_trigger_workflow_success(self, mock_post, n8n_client):
+    async def test_trigger_workflow_success(self, n8n_client):
         """Test successful workflow triggering"""
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "success": True,
-            "workflowId": "test_workflow_123"
-        }
-        mock_post.return_value = mock_response
+        # The router's default trigger route responds successfully
 
         # Test data
         test_data = {
@@ -91,15 +149,10 @@ class TestN8NClient:
         assert result.n8n_execution_id == "test_workflow_123"
         assert result.duration_seconds is not None
 
-    @pytest.mark.asyncio
-    @patch('httpx.AsyncClient.post')
-    async def test_trigger_workflow_failure(self, mock_post, n8n_client):
+    async def test_trigger_workflow_failure(self, n8n_client, router):
         """Test workflow triggering failure"""
         # Mock failure response
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-        mock_post.return_value = mock_response
+        router["trigger"].respond(500, text="Internal Server Error")
 
         # Test data
         test_data = {"analysisType": "photo"}
@@ -114,27 +167,33 @@ class TestN8NClient:
         assert result.status == WorkflowStatus.FAILED
         assert "HTTP 500" in result.error_message
         assert result.completed_at is not None
+        assert result.duration_seconds is not None
 
-    @pytest.mark.asyncio
     async def test_trigger_unknown_workflow(self, n8n_client):
         """Test triggering unknown workflow type"""
         # This would require modifying the enum, so we'll test the error handling
-        with pytest.raises(N8NAPIError, match="Unknown workflow type"):
-            # Create a mock workflow type that doesn't exist in configs
-            n8n_client.workflow_configs.clear()
-            await n8n_client.trigger_workflow(
-                WorkflowType.CUSTOMER_ANALYSIS,
-                {"test": "data"}
-            )
+        # against an empty config map, leaving the shared client's configs intact
+        with patch.object(n8n_client, 'workflow_configs', {}):
+            with pytest.raises(N8NAPIError, match="Unknown workflow type"):
+                await n8n_client.trigger_workflow(
+                    WorkflowType.CUSTOMER_ANALYSIS,
+                    {"test": "data"}
+                )
 
-    @pytest.mark.asyncio
     async def test_batch_trigger_workflows(self, n8n_client):
         """Test batch workflow triggering"""
-        with patch.object(n8n_client, 'trigger_workflow') as mock_trigger:
-            # Mock successful executions
-            mock_execution = MagicMock()
-            mock_execution.status = WorkflowStatus.COMPLETED
-            mock_trigger.return_value = mock_execution
+        # Mock successful executions that yield once, logging when each starts and ends
+        mock_execution = MagicMock()
+        mock_execution.status = WorkflowStatus.COMPLETED
+        events = []
+
+        async def trigger(workflow_type, **kwargs):
+            events.append("start")
+            await asyncio.sleep(0)
+            events.append("end")
+            return mock_execution
+
+        with patch.object(n8n_client, 'trigger_workflow', side_effect=trigger) as mock_trigger:
 
             # Test batch execution
             workflow_types = [
@@ -162,14 +221,60 @@ class TestN8NClient:
             assert first_call[1]['data']['source'] == "batch_test"
             assert first_call[1]['data']['batchId'] == "batch_test"
 
-    @pytest.mark.asyncio
-    @patch('httpx.AsyncClient.get')
-    async def test_health_check_healthy(self, mock_get, n8n_client):
+            # All workflows in a batch share one trigger timestamp
+            triggered = {call[1]['triggered_at'] for call in mock_trigger.call_args_list}
+            assert len(triggered) == 1
+
+            # Every trigger starts before any finishes, so they ran concurrently
+            assert events == ["start", "start", "end", "end"]
+
+    async def test_batch_trigger_workflows_concurrency(self, n8n_client):
+        """Test batch triggers overlap but respect max_concurrency"""
+        in_flight = 0
+        peak = 0
+
+        async def slow_trigger(workflow_type, data, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(status=WorkflowStatus.COMPLETED, input_data=data)
+
+        with patch.object(n8n_client, 'trigger_workflow', side_effect=slow_trigger):
+            results = await n8n_client.batch_trigger_workflows(
+                workflow_types=[WorkflowType.CUSTOMER_ANALYSIS] * 4,
+                shared_data={},
+                max_concurrency=2
+            )
+
+        assert peak == 2
+        assert [r.input_data["batchIndex"] for r in results] == [0, 1, 2, 3]
+
+    async def test_batch_trigger_workflows_failure_cancels_siblings(self, n8n_client):
+        """Test one failed trigger cancels the rest instead of leaving them running"""
+        finished = []
+
+        async def trigger(workflow_type, data, **kwargs):
+            if data["batchIndex"] == 0:
+                raise N8NAPIError("Unknown workflow type")
+            await asyncio.sleep(0.05)
+            finished.append(data["batchIndex"])
+            return MagicMock(status=WorkflowStatus.COMPLETED, input_data=data)
+
+        with patch.object(n8n_client, 'trigger_workflow', side_effect=trigger):
+            with pytest.raises(N8NAPIError, match="Unknown workflow type"):
+                await n8n_client.batch_trigger_workflows(
+                    workflow_types=[WorkflowType.CUSTOMER_ANALYSIS] * 3,
+                    shared_data={}
+                )
+            await asyncio.sleep(0.1)
+
+        assert finished == []
+
+    async def test_health_check_healthy(self, n8n_client):
         """Test health check when all services are healthy"""
-        # Mock successful responses for all endpoints
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
+        # The router's default probe routes all respond successfully
 
         health = await n8n_client.health_check()
 
@@ -178,19 +283,28 @@ class TestN8NClient:
         assert health.n8n_connection is True
         assert health.webhook_server_status is True
 
-    @pytest.mark.asyncio
-    @patch('httpx.AsyncClient.get')
-    async def test_health_check_degraded(self, mock_get, n8n_client):
-        """Test health check when some services are down"""
-        def mock_get_side_effect(url, **kwargs):
-            response = MagicMock()
-            if "n8n" in str(url):
-                response.status_code = 200  # N8N is up
-            else:
-                response.status_code = 500  # Others are down
-            return response
+    async def test_health_check_cached(self, n8n_client, router):
+        """Test repeated and concurrent health checks reuse one probe round"""
+        first, second = await asyncio.gather(
+            n8n_client.health_check(),
+            n8n_client.health_check()
+        )
+        probe_calls = router.calls.call_count
 
-        mock_get.side_effect = mock_get_side_effect
+        assert first is second
+        assert await n8n_client.health_check() is first
+        assert router.calls.call_count == probe_calls
+
+        # Expired cache probes again
+        n8n_client.health_cache_ttl = 0
+        await n8n_client.health_check()
+        assert router.calls.call_count == probe_calls * 2
+
+    async def test_health_check_degraded(self, n8n_client, router):
+        """Test health check when some services are down"""
+        # N8N is up, others are down
+        for name in ("webhook_server", "sanzo_api", "photo_analysis"):
+            router[name].respond(500)
 
         health = await n8n_client.health_check()
 
@@ -198,23 +312,10 @@ class TestN8NClient:
         assert health.n8n_connection is True
         assert health.webhook_server_status is False
 
-    @pytest.mark.asyncio
-    @patch('httpx.AsyncClient.get')
-    async def test_list_workflow_executions(self, mock_get, n8n_client):
+    async def test_list_workflow_executions(self, n8n_client, router):
         """Test listing workflow executions"""
         # Mock N8N API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": [
-                {
-                    "id": "execution_1",
-                    "status": "success",
-                    "data": {"test": "data"}
-                }
-            ]
-        }
-        mock_get.return_value = mock_response
+        router["executions"].respond(200, content=LIST_EXECUTIONS_JSON, headers=JSON_HEADERS)
 
         # Mock the conversion method
         with patch.object(n8n_client, '_convert_n8n_execution') as mock_convert:
@@ -229,21 +330,18 @@ class TestN8NClient:
             assert len(executions) == 1
             assert executions[0] == mock_execution
 
-    @pytest.mark.asyncio
-    @patch('httpx.AsyncClient.post')
-    async def test_cancel_workflow_execution(self, mock_post, n8n_client):
+    async def test_cancel_workflow_execution(self, n8n_client, router):
         """Test cancelling workflow execution"""
         # Mock successful cancellation
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_post.return_value = mock_response
+        stop = router.post(
+            f"{n8n_client.n8n_base_url}/api/v1/executions/test_execution_123/stop"
+        ).respond(200)
 
         result = await n8n_client.cancel_workflow_execution("test_execution_123")
 
         assert result is True
-        mock_post.assert_called_once()
+        assert stop.call_count == 1
 
-    @pytest.mark.asyncio
     async def test_get_workflow_metrics(self, n8n_client):
         """Test getting workflow metrics"""
         with patch.object(n8n_client, 'list_workflow_executions') as mock_list:
@@ -263,7 +361,6 @@ class TestN8NClient:
             assert metrics["average_duration"] == 1.5
             assert metrics["success_rate"] == pytest.approx(66.67, rel=1e-2)
 
-    @pytest.mark.asyncio
     async def test_context_manager(self):
         """Test N8N client as async context manager"""
         async with N8NClient() as client:
@@ -273,18 +370,18 @@ class TestN8NClient:
         # Client should be closed after context
         # We can't easily test this without accessing private attributes
 
-    @pytest.mark.asyncio
-    async def test_client_close(self, n8n_client):
+    async def test_client_close(self):
         """Test proper client cleanup"""
+        client = N8NClient()
+
         # Should not raise any exceptions
-        await n8n_client.close()
+        await client.close()
 
-    @pytest.mark.asyncio
-    @patch('httpx.AsyncClient.get')
-    async def test_connection_error_handling(self, mock_get, n8n_client):
+    async def test_connection_error_handling(self, n8n_client, router):
         """Test handling of connection errors"""
-        # Mock connection error
-        mock_get.side_effect = Exception("Connection failed")
+        # Mock connection error on every probe
+        for name in n8n_client._probe_urls:
+            router[name].mock(side_effect=httpx.ConnectError("Connection failed"))
 
         # Health check should handle the error gracefully
         health = await n8n_client.health_check()
@@ -293,26 +390,20 @@ class TestN8NClient:
         assert health.n8n_connection is False
         assert health.webhook_server_status is False
 
-    @pytest.mark.asyncio
     async def test_workflow_data_enrichment(self, n8n_client):
         """Test that workflow data is properly enriched with metadata"""
-        with patch('httpx.AsyncClient.post') as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {"success": True}
-            mock_post.return_value = mock_response
-
-            original_data = {"test": "value"}
-            result = await n8n_client.trigger_workflow(
-                WorkflowType.CUSTOMER_ANALYSIS,
-                original_data,
-                correlation_id="test_corr"
-            )
+        # The router's default trigger route responds successfully
+        original_data = {"test": "value"}
+        result = await n8n_client.trigger_workflow(
+            WorkflowType.CUSTOMER_ANALYSIS,
+            original_data,
+            correlation_id="test_corr"
+        )
 
-            # Check that original data was preserved and metadata was added
-            assert result.input_data["test"] == "value"
-            assert result.input_data["source"] == "sanzo-n8n-mcp"
-            assert result.input_data["workflowType"] == "customer-analysis"
-            assert result.input_data["correlationId"] == "test_corr"
-            assert "triggeredAt" in result.input_data
-            assert "executionId" in result.input_data
\ No newline at end of file
+        # Check that original data was preserved and metadata was added
+        assert result.input_data["test"] == "value"
+        assert result.input_data["source"] == "sanzo-n8n-mcp"
+        assert result.input_data["workflowType"] == "customer-analysis"
+        assert result.input_data["correlationId"] == "test_corr"
+        assert "triggeredAt" in result.input_data
+        assert "executionId" in result.input_data
\ No newline at end of file
@@ -3,28 +3,56 @@ Tests for Workflow Manager functionality
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from sanzo_n8n_mcp.workflow_manager import WorkflowManager, WorkflowQueue
+from sanzo_n8n_mcp.workflow_manager import WorkflowManager, WorkflowQueue, WorkflowStats
 from sanzo_n8n_mcp.models import (
     WorkflowType,
     WorkflowStatus,
-    WorkflowExecution,
     BatchWorkflowRequest,
     WorkflowTriggerConfig,
     TriggerType
 )
 
 
+@pytest.fixture(scope="module")
+def trigger_config():
+    """Enabled customer analysis trigger (shared, copy with model_copy to vary)"""
+    return WorkflowTriggerConfig(
+        trigger_name="test_trigger",
+        workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
+        trigger_conditions={}
+    )
+
+
+class _Exec:
+    """Minimal execution record for metrics tests, cheaper than a MagicMock"""
+
+    __slots__ = ("started_at", "workflow_type", "status", "duration_seconds")
+
+    def __init__(
+        self,
+        started_at,
+        workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
+        status=WorkflowStatus.COMPLETED,
+        duration_seconds=None
+    ):
+        self.started_at = started_at
+        self.workflow_type = workflow_type
+        self.status = status
+        self.duration_seconds = duration_seconds
+
+
 class TestWorkflowQueue:
     """Test suite for WorkflowQueue"""
 
     def test_queue_initialization(self):
         """Test queue initialization"""
         queue = WorkflowQueue(max_size=100)
-        assert queue.queue.maxlen == 100
+        assert queue.max_size == 100
         assert queue.max_concurrent == 5
         assert len(queue.running_workflows) == 0
         assert len(queue.completed_workflows) == 0
@@ -38,7 +66,7 @@ class TestWorkflowQueue:
 
         assert result is True
         assert len(queue.queue) == 1
-        assert queue.queue[0] == execution
+        assert queue.queue[0][-1] == execution
 
     def test_add_workflow_queue_full(self):
         """Test adding workflow when queue is full"""
@@ -82,6 +110,20 @@ class TestWorkflowQueue:
         next_workflow = queue.get_next_workflow()
         assert next_workflow is None
 
+    def test_get_next_workflow_by_priority(self):
+        """Test higher priority workflows are returned first, ties in FIFO order"""
+        queue = WorkflowQueue()
+        low, normal_first, normal_second, high = (MagicMock() for _ in range(4))
+
+        queue.add_workflow(low, priority=1)
+        queue.add_workflow(normal_first)
+        queue.add_workflow(normal_second)
+        queue.add_workflow(high, priority=10)
+
+        assert [queue.get_next_workflow() for _ in range(4)] == [
+            high, normal_first, normal_second, low
+        ]
+
     def test_mark_running_and_completed(self):
         """Test marking workflows as running and completed"""
         queue = WorkflowQueue()
@@ -97,19 +139,85 @@ class TestWorkflowQueue:
         assert "test_id" not in queue.running_workflows
         assert queue.completed_workflows["test_id"] == execution
 
+    def test_completed_workflows_bounded(self):
+        """Test oldest completed workflows are evicted past max_completed"""
+        queue = WorkflowQueue(max_completed=2)
+
+        for i in range(3):
+            execution = MagicMock()
+            execution.execution_id = f"test_{i}"
+            queue.mark_completed(execution)
+
+        assert list(queue.completed_workflows) == ["test_1", "test_2"]
+
+    async def test_wait_for_workflow_wakes_on_add(self):
+        """Test waiting processor is woken when a workflow is added"""
+        queue = WorkflowQueue()
+
+        waiter = asyncio.create_task(queue.wait_for_workflow())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        queue.add_workflow(MagicMock())
+        await asyncio.wait_for(waiter, timeout=1)
+
+    async def test_completion_future_resolved_on_mark_completed(self):
+        """Test completion future is resolved when workflow completes"""
+        queue = WorkflowQueue()
+        execution = MagicMock()
+        execution.execution_id = "test_id"
+
+        future = queue.completion_future("test_id")
+        assert queue.completion_future("test_id") is future
+        assert not future.done()
 
+        queue.mark_completed(execution)
+        assert await future is execution
+        assert "test_id" not in queue.completion_futures
+
+
+class TestWorkflowStats:
+    """Test suite for WorkflowStats"""
+
+    def test_record_evicts_oldest(self):
+        """Test running totals only cover the most recent executions"""
+        stats = WorkflowStats(max_size=2)
+
+        stats.record(MagicMock(status=WorkflowStatus.FAILED, duration_seconds=None, started_at=datetime(2024, 1, 1)))
+        stats.record(MagicMock(status=WorkflowStatus.COMPLETED, duration_seconds=1.0, started_at=datetime(2024, 1, 2)))
+        stats.record(MagicMock(status=WorkflowStatus.COMPLETED, duration_seconds=3.0, started_at=datetime(2024, 1, 3)))
+
+        assert stats.total == 2
+        assert stats.successful == 2
+        assert stats.failed == 0
+        assert stats.duration_sum / stats.duration_count == 2.0
+        assert stats.last_started_at == datetime(2024, 1, 3)
+
+
+@pytest.mark.asyncio(loop_scope="class")
 class TestWorkflowManager:
     """Test suite for WorkflowManager"""
 
-    @pytest.fixture
+    @pytest_asyncio.fixture(scope="class", loop_scope="class")
     async def workflow_manager(self, mock_n8n_client):
-        """Create workflow manager for testing"""
+        """One started workflow manager shared by the class, on the class's loop"""
         manager = WorkflowManager(mock_n8n_client)
         await manager.start()
         yield manager
         await manager.stop()
 
-    @pytest.mark.asyncio
+    @pytest_asyncio.fixture(autouse=True, loop_scope="class")
+    async def reset_workflow_manager(self, workflow_manager):
+        """Return the shared manager to a clean state after each test"""
+        queue = workflow_manager.queue
+        max_size = queue.max_size
+        yield
+
+        queue.queue.clear()
+        queue.running_workflows.clear()
+        queue.max_size = max_size
+        await workflow_manager.reset_state()
+
     async def test_manager_start_stop(self, mock_n8n_client):
         """Test workflow manager start and stop"""
         manager = WorkflowManager(mock_n8n_client)
@@ -126,21 +234,9 @@ class TestWorkflowManager:
         await manager.stop()
         assert not manager._running
 
-    @pytest.mark.asyncio
     async def test_execute_workflow_success(self, workflow_manager, mock_n8n_client):
         """Test successful workflow execution"""
-        # Mock successful N8N execution
-        mock_execution = WorkflowExecution(
-            execution_id="test_123",
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            status=WorkflowStatus.COMPLETED,
-            input_data={"test": "data"},
-            started_at=datetime.now(),
-            completed_at=datetime.now(),
-            duration_seconds=1.0
-        )
-        mock_n8n_client.trigger_workflow.return_value = mock_execution
-
+        # The mock client returns conftest's shared completed execution
         # Execute workflow
         result = await workflow_manager.execute_workflow(
             workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
@@ -153,11 +249,36 @@ class TestWorkflowManager:
         assert result.correlation_id == "test_correlation"
         assert result.input_data["analysisType"] == "photo"
 
-    @pytest.mark.asyncio
+    async def test_execute_workflow_runs_concurrently(self, workflow_manager, mock_n8n_client):
+        """Test queued workflows are triggered in parallel up to max_concurrent"""
+        in_flight = 0
+        peak = 0
+
+        async def slow_trigger(workflow_type, data, correlation_id=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return mock_n8n_client.trigger_workflow.return_value
+
+        mock_n8n_client.trigger_workflow.side_effect = slow_trigger
+
+        results = await asyncio.gather(*(
+            workflow_manager.execute_workflow(
+                workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
+                data={"index": i}
+            )
+            for i in range(8)
+        ))
+
+        assert all(r.status == WorkflowStatus.COMPLETED for r in results)
+        assert peak == workflow_manager.queue.max_concurrent
+
     async def test_execute_workflow_queue_full(self, workflow_manager):
         """Test workflow execution when queue is full"""
-        # Fill the queue by setting maxlen to 0
-        workflow_manager.queue.queue.maxlen = 0
+        # Fill the queue by setting its capacity to 0
+        workflow_manager.queue.max_size = 0
 
         result = await workflow_manager.execute_workflow(
             workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
@@ -167,7 +288,6 @@ class TestWorkflowManager:
         assert result.status == WorkflowStatus.FAILED
         assert "queue is full" in result.error_message
 
-    @pytest.mark.asyncio
     async def test_execute_batch_workflows(self, workflow_manager, mock_n8n_client):
         """Test batch workflow execution"""
         # Mock successful executions
@@ -197,31 +317,89 @@ class TestWorkflowManager:
             assert len(result.execution_results) == 2
             assert mock_execute.call_count == 2
 
-    @pytest.mark.asyncio
-    async def test_execute_batch_workflows_fail_fast(self, workflow_manager):
-        """Test batch workflow execution with fail_fast enabled"""
+    async def test_execute_batch_workflows_request_order(self, workflow_manager):
+        """Test batch results follow the request order, not completion order"""
+        durations = {
+            WorkflowType.PHOTO_ANALYSIS_PROCESSING: 0.05,
+            WorkflowType.CRM_LEAD_MANAGEMENT: 0.0
+        }
+
+        async def fake_execute(workflow_type, data, correlation_id=None):
+            await asyncio.sleep(durations[workflow_type])
+            return MagicMock(workflow_type=workflow_type, status=WorkflowStatus.COMPLETED)
+
+        with patch.object(workflow_manager, 'execute_workflow', side_effect=fake_execute):
+            batch_request = BatchWorkflowRequest(
+                workflows=[
+                    WorkflowType.PHOTO_ANALYSIS_PROCESSING,
+                    WorkflowType.CRM_LEAD_MANAGEMENT
+                ]
+            )
+
+            result = await workflow_manager.execute_batch_workflows(batch_request)
+
+        assert [execution.workflow_type for execution in result.execution_results] == [
+            WorkflowType.PHOTO_ANALYSIS_PROCESSING,
+            WorkflowType.CRM_LEAD_MANAGEMENT
+        ]
+        assert result.successful_workflows == 2
+
+    async def test_execute_batch_workflows_fail_fast(self, workflow_manager, mock_n8n_client, mock_execution):
+        """Test a fail_fast batch never triggers workflows after the first failure"""
         # Mock first execution failing
-        failed_execution = MagicMock()
-        failed_execution.status = WorkflowStatus.FAILED
+        mock_n8n_client.trigger_workflow.return_value = mock_execution.model_copy(
+            update={"status": WorkflowStatus.FAILED, "error_message": "boom"}
+        )
+
+        batch_request = BatchWorkflowRequest(
+            workflows=[
+                WorkflowType.CUSTOMER_ANALYSIS,
+                WorkflowType.CRM_LEAD_MANAGEMENT,
+                WorkflowType.FOLLOW_UP_SEQUENCES,
+                WorkflowType.PHOTO_ANALYSIS_PROCESSING
+            ],
+            shared_data={"source": "batch"},
+            fail_fast=True
+        )
+
+        result = await workflow_manager.execute_batch_workflows(batch_request)
+
+        # Only the first workflow may reach N8N due to fail_fast
+        assert mock_n8n_client.trigger_workflow.await_count == 1
+        assert len(result.execution_results) == 1
+        assert result.failed_workflows == 1
+        assert result.successful_workflows == 0
+
+    async def test_stream_batch_workflows_completion_order(self, workflow_manager):
+        """Test streamed batch yields fast workflows before slow ones"""
+        durations = {
+            WorkflowType.PHOTO_ANALYSIS_PROCESSING: 0.05,
+            WorkflowType.CRM_LEAD_MANAGEMENT: 0.0
+        }
+
+        async def fake_execute(workflow_type, data, correlation_id=None):
+            await asyncio.sleep(durations[workflow_type])
+            return MagicMock(workflow_type=workflow_type, input_data=data)
 
-        with patch.object(workflow_manager, 'execute_workflow', return_value=failed_execution) as mock_execute:
+        with patch.object(workflow_manager, 'execute_workflow', side_effect=fake_execute):
             batch_request = BatchWorkflowRequest(
                 workflows=[
-                    WorkflowType.CUSTOMER_ANALYSIS,
+                    WorkflowType.PHOTO_ANALYSIS_PROCESSING,
                     WorkflowType.CRM_LEAD_MANAGEMENT
                 ],
-                shared_data={"source": "batch"},
-                fail_fast=True
+                correlation_id="stream_test"
             )
 
-            result = await workflow_manager.execute_batch_workflows(batch_request)
+            order = [
+                execution.workflow_type
+                async for execution in workflow_manager.stream_batch_workflows(batch_request)
+            ]
 
-            # Should only execute first workflow due to fail_fast
-            assert mock_execute.call_count == 1
-            assert result.failed_workflows == 1
-            assert result.successful_workflows == 0
+        assert order == [
+            WorkflowType.CRM_LEAD_MANAGEMENT,
+            WorkflowType.PHOTO_ANALYSIS_PROCESSING
+        ]
 
-    @pytest.mark.asyncio
     async def test_get_workflow_metrics_no_data(self, workflow_manager):
         """Test getting metrics when no executions exist"""
         metrics = await workflow_manager.get_workflow_metrics(WorkflowType.CUSTOMER_ANALYSIS)
@@ -234,28 +412,16 @@ class TestWorkflowManager:
         assert metrics.success_rate == 0.0
         assert metrics.last_execution is None
 
-    @pytest.mark.asyncio
-    async def test_get_workflow_metrics_with_data(self, workflow_manager):
+    async def test_get_workflow_metrics_with_data(self, workflow_manager, frozen_now):
         """Test getting metrics with execution data"""
         # Add mock execution data
         mock_executions = [
-            MagicMock(
-                status=WorkflowStatus.COMPLETED,
-                duration_seconds=1.0,
-                started_at=datetime.now()
-            ),
-            MagicMock(
-                status=WorkflowStatus.COMPLETED,
-                duration_seconds=2.0,
-                started_at=datetime.now()
-            ),
-            MagicMock(
-                status=WorkflowStatus.FAILED,
-                duration_seconds=None,
-                started_at=datetime.now()
-            )
+            _Exec(frozen_now, status=WorkflowStatus.COMPLETED, duration_seconds=1.0),
+            _Exec(frozen_now, status=WorkflowStatus.COMPLETED, duration_seconds=2.0),
+            _Exec(frozen_now, status=WorkflowStatus.FAILED)
         ]
-        workflow_manager.metrics_store[WorkflowType.CUSTOMER_ANALYSIS] = mock_executions
+        for execution in mock_executions:
+            workflow_manager._update_metrics(execution)
 
         metrics = await workflow_manager.get_workflow_metrics(WorkflowType.CUSTOMER_ANALYSIS)
 
@@ -266,31 +432,22 @@ class TestWorkflowManager:
         assert metrics.success_rate == pytest.approx(66.67, rel=1e-2)
         assert metrics.last_execution is not None
 
-    @pytest.mark.asyncio
-    async def test_add_automated_trigger(self, workflow_manager):
+    async def test_add_automated_trigger(self, workflow_manager, trigger_config):
         """Test adding automated trigger configuration"""
-        trigger_config = WorkflowTriggerConfig(
-            trigger_name="test_trigger",
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            trigger_conditions={"condition": "value"},
-            enabled=True,
-            max_executions_per_hour=10
-        )
+        trigger_config = trigger_config.model_copy(update={
+            "trigger_conditions": {"condition": "value"},
+            "max_executions_per_hour": 10
+        })
 
         await workflow_manager.add_automated_trigger(trigger_config)
 
         assert "test_trigger" in workflow_manager.trigger_configs
         assert workflow_manager.trigger_configs["test_trigger"] == trigger_config
+        assert workflow_manager._enabled_triggers == [trigger_config]
 
-    @pytest.mark.asyncio
-    async def test_remove_automated_trigger(self, workflow_manager):
+    async def test_remove_automated_trigger(self, workflow_manager, trigger_config):
         """Test removing automated trigger"""
         # Add trigger first
-        trigger_config = WorkflowTriggerConfig(
-            trigger_name="test_trigger",
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            trigger_conditions={}
-        )
         await workflow_manager.add_automated_trigger(trigger_config)
 
         # Remove trigger
@@ -298,12 +455,12 @@ class TestWorkflowManager:
 
         assert result is True
         assert "test_trigger" not in workflow_manager.trigger_configs
+        assert workflow_manager._enabled_triggers == []
 
         # Try to remove non-existent trigger
         result = await workflow_manager.remove_automated_trigger("non_existent")
         assert result is False
 
-    @pytest.mark.asyncio
     async def test_list_automated_triggers(self, workflow_manager):
         """Test listing automated triggers"""
         # Initially empty
@@ -327,14 +484,13 @@ class TestWorkflowManager:
 
         triggers = await workflow_manager.list_automated_triggers()
         assert len(triggers) == 2
-        assert trigger1 in triggers
-        assert trigger2 in triggers
+        triggers_by_name = {trigger.trigger_name: trigger for trigger in triggers}
+        assert triggers_by_name == {"trigger1": trigger1, "trigger2": trigger2}
 
-    @pytest.mark.asyncio
     async def test_get_queue_status(self, workflow_manager):
         """Test getting queue status"""
         # Add some mock data
-        workflow_manager.queue.queue.append(MagicMock())
+        workflow_manager.queue.add_workflow(MagicMock())
         workflow_manager.queue.running_workflows.add("test_id")
         workflow_manager.queue.completed_workflows["completed_id"] = MagicMock()
 
@@ -345,17 +501,11 @@ class TestWorkflowManager:
         assert status["completed_workflows"] == 1
         assert status["max_concurrent"] == 5
 
-    @pytest.mark.asyncio
-    async def test_cleanup_old_executions(self, workflow_manager):
+    async def test_cleanup_old_executions(self, workflow_manager, frozen_now):
         """Test cleanup of old execution records"""
-        from datetime import timedelta
-
         # Add old and new executions
-        old_execution = MagicMock()
-        old_execution.started_at = datetime.now() - timedelta(days=10)
-
-        new_execution = MagicMock()
-        new_execution.started_at = datetime.now()
+        old_execution = _Exec(frozen_now - timedelta(days=10))
+        new_execution = _Exec(frozen_now)
 
         workflow_manager.metrics_store[WorkflowType.CUSTOMER_ANALYSIS] = [
             old_execution, new_execution
@@ -363,8 +513,10 @@ class TestWorkflowManager:
         workflow_manager.queue.completed_workflows["old_id"] = old_execution
         workflow_manager.queue.completed_workflows["new_id"] = new_execution
 
-        # Cleanup with 7-day retention
-        await workflow_manager.cleanup_old_executions(retention_days=7)
+        # Cleanup with 7-day retention, measured from the frozen clock
+        with patch('sanzo_n8n_mcp.workflow_manager.datetime', wraps=datetime) as mock_datetime:
+            mock_datetime.now.return_value = frozen_now
+            await workflow_manager.cleanup_old_executions(retention_days=7)
 
         # Only new execution should remain
         assert len(workflow_manager.metrics_store[WorkflowType.CUSTOMER_ANALYSIS]) == 1
@@ -372,11 +524,28 @@ class TestWorkflowManager:
         assert "old_id" not in workflow_manager.queue.completed_workflows
         assert "new_id" in workflow_manager.queue.completed_workflows
 
-    @pytest.mark.asyncio
-    async def test_should_trigger_workflow_rate_limiting(self, workflow_manager):
-        """Test automated trigger rate limiting"""
-        from datetime import timedelta
+    async def test_reset_state(self, workflow_manager, frozen_now, trigger_config):
+        """Test reset clears executions, metrics and triggers"""
+        execution = MagicMock(
+            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
+            status=WorkflowStatus.COMPLETED,
+            duration_seconds=1.0,
+            started_at=frozen_now
+        )
+        workflow_manager._update_metrics(execution)
+        workflow_manager.queue.completed_workflows["done_id"] = execution
+        await workflow_manager.add_automated_trigger(trigger_config)
+
+        await workflow_manager.reset_state()
 
+        metrics = await workflow_manager.get_workflow_metrics(WorkflowType.CUSTOMER_ANALYSIS)
+        assert metrics.total_executions == 0
+        assert workflow_manager.queue.completed_workflows == {}
+        assert workflow_manager.trigger_configs == {}
+        assert workflow_manager._enabled_triggers == []
+
+    async def test_should_trigger_workflow_rate_limiting(self, workflow_manager, frozen_now):
+        """Test automated trigger rate limiting"""
         trigger_config = WorkflowTriggerConfig(
             trigger_name="rate_limited_trigger",
             workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
@@ -385,30 +554,59 @@ class TestWorkflowManager:
         )
 
         # Add recent executions that exceed rate limit
-        recent_time = datetime.now() - timedelta(minutes=30)
-        workflow_manager.metrics_store[WorkflowType.CUSTOMER_ANALYSIS] = [
-            MagicMock(started_at=recent_time),
-            MagicMock(started_at=recent_time),
-            MagicMock(started_at=recent_time)  # 3 executions, limit is 2
-        ]
+        recent_time = frozen_now - timedelta(minutes=30)
+        with patch('sanzo_n8n_mcp.workflow_manager.datetime', wraps=datetime) as mock_datetime:
+            mock_datetime.now.return_value = frozen_now
+            for _ in range(3):  # 3 executions, limit is 2
+                workflow_manager._update_metrics(_Exec(recent_time, duration_seconds=1.0))
 
         # Should not trigger due to rate limiting
         should_trigger = await workflow_manager._should_trigger_workflow(
-            trigger_config, datetime.now()
+            trigger_config, frozen_now
         )
 
         assert should_trigger is False
 
-    @pytest.mark.asyncio
-    async def test_update_metrics(self, workflow_manager):
+    async def test_count_recent_executions_sliding_window(self, workflow_manager, frozen_now):
+        """Test hourly execution count drops executions older than an hour"""
+        # Recorded in completion order, so start times arrive out of order
+        with patch('sanzo_n8n_mcp.workflow_manager.datetime', wraps=datetime) as mock_datetime:
+            mock_datetime.now.return_value = frozen_now
+            for minutes_ago in (30, 90, 10, 50):
+                workflow_manager._update_metrics(
+                    _Exec(frozen_now - timedelta(minutes=minutes_ago), duration_seconds=1.0)
+                )
+
+        assert list(workflow_manager._recent_starts[WorkflowType.CUSTOMER_ANALYSIS]) == [
+            frozen_now - timedelta(minutes=minutes_ago) for minutes_ago in (50, 30, 10)
+        ]
+        assert workflow_manager._count_recent_executions(WorkflowType.CUSTOMER_ANALYSIS, frozen_now) == 3
+        assert workflow_manager._count_recent_executions(
+            WorkflowType.CUSTOMER_ANALYSIS, frozen_now + timedelta(minutes=40)
+        ) == 1
+
+    async def test_recent_starts_bounded_without_trigger(self, workflow_manager, frozen_now):
+        """Test the rate-limit window stays bounded for a type no trigger ever reads"""
+        with patch('sanzo_n8n_mcp.workflow_manager.datetime', wraps=datetime) as mock_datetime:
+            mock_datetime.now.return_value = frozen_now
+            for minutes_ago in range(5000):
+                workflow_manager._update_metrics(_Exec(
+                    frozen_now - timedelta(minutes=minutes_ago),
+                    workflow_type=WorkflowType.FOLLOW_UP_SEQUENCES
+                ))
+
+        assert len(workflow_manager._recent_starts[WorkflowType.FOLLOW_UP_SEQUENCES]) == 60
+
+        # Cleanup drops the rest once the window has passed
+        with patch('sanzo_n8n_mcp.workflow_manager.datetime', wraps=datetime) as mock_datetime:
+            mock_datetime.now.return_value = frozen_now + timedelta(hours=2)
+            await workflow_manager.cleanup_old_executions()
+
+        assert WorkflowType.FOLLOW_UP_SEQUENCES not in workflow_manager._recent_starts
+
+    async def test_update_metrics(self, workflow_manager, mock_execution):
         """Test metrics update functionality"""
-        execution = WorkflowExecution(
-            execution_id="test_123",
-            workflow_type=WorkflowType.CUSTOMER_ANALYSIS,
-            status=WorkflowStatus.COMPLETED,
-            input_data={},
-            started_at=datetime.now()
-        )
+        execution = mock_execution
 
         # Initially no metrics
         assert len(workflow_manager.metrics_store[WorkflowType.CUSTOMER_ANALYSIS]) == 0
@@ -420,15 +618,13 @@ class TestWorkflowManager:
         assert len(workflow_manager.metrics_store[WorkflowType.CUSTOMER_ANALYSIS]) == 1
         assert workflow_manager.metrics_store[WorkflowType.CUSTOMER_ANALYSIS][0] == execution
 
-    @pytest.mark.asyncio
-    async def test_update_metrics_pruning(self, workflow_manager):
+    async def test_update_metrics_pruning(self, workflow_manager, frozen_now):
         """Test metrics pruning when exceeding max executions"""
-        # Create many executions
-        executions = []
-        for i in range(1005):  # Exceed the 1000 limit
-            execution = MagicMock()
-            execution.started_at = datetime.now()
-            executions.append(execution)
+        # Create many executions, one second apart
+        executions = [
+            _Exec(frozen_now + timedelta(seconds=i))
+            for i in range(1005)  # Exceed the 1000 limit
+        ]
 
         # Add all executions
         for execution in executions:
@@ -5,129 +5,149 @@ Checks cross-references between sanzo-colors.json and combinations.json
 """
 
 import json
+import re
 import sys
+from collections import Counter
 from pathlib import Path
 
+# orjson parses faster when installed; the stdlib parser is the fallback
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Document schemas, declared once at import instead of rebuilt per record
+REQUIRED_COLORS_KEYS = ('metadata', 'categories', 'colors')
+REQUIRED_COLOR_FIELDS = (
+    'id', 'name_japanese', 'name_english', 'name_romanized',
+    'hex', 'rgb', 'lab', 'hsl', 'category',
+    'psychological_effects', 'historical_use', 'cultural_significance',
+    'sanzo_plate', 'frequency_in_combinations', 'season_association',
+    'texture_affinity'
+)
+REQUIRED_COMBINATIONS_KEYS = ('metadata', 'harmony_types', 'usage_contexts', 'combinations')
+REQUIRED_COMBO_FIELDS = (
+    'id', 'name', 'name_japanese', 'color_ids', 'color_names',
+    'harmony_type', 'delta_e_scores', 'overall_harmony_score',
+    'usage_context', 'historical_usage', 'modern_applications',
+    'psychological_effect', 'season_association', 'cultural_significance',
+    'texture_recommendations', 'sanzo_plate_reference'
+)
+HEX_COLOR_PATTERN = re.compile(r'#[0-9A-Fa-f]{6}')
+_REQUIRED_COLOR_FIELD_SET = frozenset(REQUIRED_COLOR_FIELDS)
+_REQUIRED_COMBO_FIELD_SET = frozenset(REQUIRED_COMBO_FIELDS)
+
+def missing_fields(record, required_fields, required_set):
+    """Return the required fields absent from a record, in schema order"""
+    # Complete records (the common case) pass with one set comparison
+    if record.keys() >= required_set:
+        return []
+    return [field for field in required_fields if field not in record]
+
+def write_lines(lines):
+    """Write lines to stdout in a single call instead of one print per line"""
+    sys.stdout.write(''.join(f"{line}\n" for line in lines))
+
 def load_json_file(filename):
     """Load and parse a JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filename, 'rb') as f:
+            return json_loads(f.read())
     except Exception as e:
         print(f"Error loading {filename}: {e}")
         return None
 
-def validate_color_database(colors_data):
-    """Validate the color database structure"""
-    print("Validating sanzo-colors.json structure...")
+def validate_records(data, required_keys, records_key, kind, required_fields, required_set, check_record):
+    """
+    Run the checks shared by both databases, plus a per-record rule function
 
+    Reports missing top-level keys, missing record fields and duplicate IDs,
+    then whatever ``check_record(record, label)`` yields for each record.
+    Returns the errors and the set of record IDs seen.
+    """
     errors = []
+    record_ids = set()
 
     # Check required top-level keys
-    required_keys = ['metadata', 'categories', 'colors']
     for key in required_keys:
-        if key not in colors_data:
+        if key not in data:
             errors.append(f"Missing required key: {key}")
 
-    # Validate colors array
-    if 'colors' in colors_data:
-        colors = colors_data['colors']
-        color_ids = set()
-
-        for i, color in enumerate(colors):
-            # Check required color fields
-            required_color_fields = [
-                'id', 'name_japanese', 'name_english', 'name_romanized',
-                'hex', 'rgb', 'lab', 'hsl', 'category',
-                'psychological_effects', 'historical_use', 'cultural_significance',
-                'sanzo_plate', 'frequency_in_combinations', 'season_association',
-                'texture_affinity'
-            ]
-
-            for field in required_color_fields:
-                if field not in color:
-                    errors.append(f"Color {i}: Missing required field '{field}'")
-
-            # Check for duplicate IDs
-            if 'id' in color:
-                if color['id'] in color_ids:
-                    errors.append(f"Duplicate color ID: {color['id']}")
-                color_ids.add(color['id'])
-
-            # Validate HEX format
-            if 'hex' in color:
-                hex_color = color['hex']
-                if not hex_color.startswith('#') or len(hex_color) != 7:
-                    errors.append(f"Color {color.get('id', i)}: Invalid HEX format: {hex_color}")
-
-            # Validate RGB values
-            if 'rgb' in color:
-                rgb = color['rgb']
-                for component in ['r', 'g', 'b']:
-                    if component not in rgb:
-                        errors.append(f"Color {color.get('id', i)}: Missing RGB component '{component}'")
-                    elif not (0 <= rgb[component] <= 255):
-                        errors.append(f"Color {color.get('id', i)}: RGB {component} value out of range: {rgb[component]}")
-
-    return errors, color_ids
+    for i, record in enumerate(data.get(records_key, ())):
+        # Check required record fields
+        for field in missing_fields(record, required_fields, required_set):
+            errors.append(f"{kind} {i}: Missing required field '{field}'")
+
+        # Check for duplicate IDs
+        if 'id' in record:
+            if record['id'] in record_ids:
+                errors.append(f"Duplicate {kind.lower()} ID: {record['id']}")
+            record_ids.add(record['id'])
+
+        errors.extend(check_record(record, f"{kind} {record.get('id', i)}"))
+
+    return errors, record_ids
+
+def check_color(color, label):
+    """Yield errors for a color's HEX and RGB values"""
+    # Validate HEX format
+    if 'hex' in color:
+        hex_color = color['hex']
+        if not isinstance(hex_color, str) or not HEX_COLOR_PATTERN.fullmatch(hex_color):
+            yield f"{label}: Invalid HEX format: {hex_color}"
+
+    # Validate RGB values
+    if 'rgb' in color:
+        rgb = color['rgb']
+        for component in ['r', 'g', 'b']:
+            if component not in rgb:
+                yield f"{label}: Missing RGB component '{component}'"
+            elif not (0 <= rgb[component] <= 255):
+                yield f"{label}: RGB {component} value out of range: {rgb[component]}"
+
+def check_combination(combo, label, valid_color_ids):
+    """Yield errors for a combination's color references and scores"""
+    # Validate color ID references; only walk the list when some are invalid
+    if 'color_ids' in combo:
+        color_ids = combo['color_ids']
+        if not valid_color_ids.issuperset(color_ids):
+            for color_id in color_ids:
+                if color_id not in valid_color_ids:
+                    yield f"{label}: References invalid color ID: {color_id}"
+
+    # Validate harmony score range
+    if 'overall_harmony_score' in combo:
+        score = combo['overall_harmony_score']
+        if not (0 <= score <= 10):
+            yield f"{label}: Harmony score out of range (0-10): {score}"
+
+    # Validate delta E scores
+    if 'delta_e_scores' in combo:
+        for delta_score in combo['delta_e_scores']:
+            if 'colors' not in delta_score or 'delta_e' not in delta_score:
+                yield f"{label}: Invalid delta E score structure"
+            elif len(delta_score['colors']) != 2:
+                yield f"{label}: Delta E score must compare exactly 2 colors"
+
+def validate_color_database(colors_data):
+    """Validate the color database structure"""
+    print("Validating sanzo-colors.json structure...")
+
+    return validate_records(
+        colors_data, REQUIRED_COLORS_KEYS, 'colors', 'Color',
+        REQUIRED_COLOR_FIELDS, _REQUIRED_COLOR_FIELD_SET, check_color
+    )
 
 def validate_combinations_database(combinations_data, valid_color_ids):
     """Validate the combinations database structure and references"""
     print("Validating combinations.json structure...")
 
-    errors = []
-
-    # Check required top-level keys
-    required_keys = ['metadata', 'harmony_types', 'usage_contexts', 'combinations']
-    for key in required_keys:
-        if key not in combinations_data:
-            errors.append(f"Missing required key: {key}")
-
-    # Validate combinations array
-    if 'combinations' in combinations_data:
-        combinations = combinations_data['combinations']
-        combination_ids = set()
-
-        for i, combo in enumerate(combinations):
-            # Check required combination fields
-            required_combo_fields = [
-                'id', 'name', 'name_japanese', 'color_ids', 'color_names',
-                'harmony_type', 'delta_e_scores', 'overall_harmony_score',
-                'usage_context', 'historical_usage', 'modern_applications',
-                'psychological_effect', 'season_association', 'cultural_significance',
-                'texture_recommendations', 'sanzo_plate_reference'
-            ]
-
-            for field in required_combo_fields:
-                if field not in combo:
-                    errors.append(f"Combination {i}: Missing required field '{field}'")
-
-            # Check for duplicate IDs
-            if 'id' in combo:
-                if combo['id'] in combination_ids:
-                    errors.append(f"Duplicate combination ID: {combo['id']}")
-                combination_ids.add(combo['id'])
-
-            # Validate color ID references
-            if 'color_ids' in combo:
-                for color_id in combo['color_ids']:
-                    if color_id not in valid_color_ids:
-                        errors.append(f"Combination {combo.get('id', i)}: References invalid color ID: {color_id}")
-
-            # Validate harmony score range
-            if 'overall_harmony_score' in combo:
-                score = combo['overall_harmony_score']
-                if not (0 <= score <= 10):
-                    errors.append(f"Combination {combo.get('id', i)}: Harmony score out of range (0-10): {score}")
-
-            # Validate delta E scores
-            if 'delta_e_scores' in combo:
-                for delta_score in combo['delta_e_scores']:
-                    if 'colors' not in delta_score or 'delta_e' not in delta_score:
-                        errors.append(f"Combination {combo.get('id', i)}: Invalid delta E score structure")
-                    elif len(delta_score['colors']) != 2:
-                        errors.append(f"Combination {combo.get('id', i)}: Delta E score must compare exactly 2 colors")
-
+    valid_color_ids = frozenset(valid_color_ids)
+    errors, _ = validate_records(
+        combinations_data, REQUIRED_COMBINATIONS_KEYS, 'combinations', 'Combination',
+        REQUIRED_COMBO_FIELDS, _REQUIRED_COMBO_FIELD_SET,
+        lambda combo, label: check_combination(combo, label, valid_color_ids)
+    )
     return errors
 
 def generate_statistics(colors_data, combinations_data):
@@ -138,37 +158,28 @@ def generate_statistics(colors_data, combinations_data):
         total_colors = len(colors_data['colors'])
         print(f"Total Colors: {total_colors}")
 
-        # Category distribution
-        categories = {}
-        seasons = {}
-        for color in colors_data['colors']:
-            cat = color.get('category', 'unknown')
-            categories[cat] = categories.get(cat, 0) + 1
-
-            season = color.get('season_association', 'unknown')
-            seasons[season] = seasons.get(season, 0) + 1
+        # Category and season distribution
+        colors = colors_data['colors']
+        categories = Counter(color.get('category', 'unknown') for color in colors)
+        seasons = Counter(color.get('season_association', 'unknown') for color in colors)
 
         print("\nColor Categories:")
-        for cat, count in sorted(categories.items()):
-            print(f"  {cat}: {count}")
+        write_lines(f"  {cat}: {count}" for cat, count in sorted(categories.items()))
 
         print("\nSeasonal Distribution:")
-        for season, count in sorted(seasons.items()):
-            print(f"  {season}: {count}")
+        write_lines(f"  {season}: {count}" for season, count in sorted(seasons.items()))
 
     if 'combinations' in combinations_data:
         total_combos = len(combinations_data['combinations'])
         print(f"\nTotal Combinations: {total_combos}")
 
         # Harmony type distribution
-        harmony_types = {}
-        for combo in combinations_data['combinations']:
-            harmony = combo.get('harmony_type', 'unknown')
-            harmony_types[harmony] = harmony_types.get(harmony, 0) + 1
+        harmony_types = Counter(
+            combo.get('harmony_type', 'unknown') for combo in combinations_data['combinations']
+        )
 
         print("\nHarmony Types:")
-        for harmony, count in sorted(harmony_types.items()):
-            print(f"  {harmony}: {count}")
+        write_lines(f"  {harmony}: {count}" for harmony, count in sorted(harmony_types.items()))
 
 def main():
     """Main validation function"""
@@ -194,13 +205,11 @@ def main():
 
     if color_errors:
         print(f"\nColor Database Errors ({len(color_errors)}):")
-        for error in color_errors:
-            print(f"  [ERROR] {error}")
+        write_lines(f"  [ERROR] {error}" for error in color_errors)
 
     if combo_errors:
         print(f"\nCombinations Database Errors ({len(combo_errors)}):")
-        for error in combo_errors:
-            print(f"  [ERROR] {error}")
+        write_lines(f"  [ERROR] {error}" for error in combo_errors)
 
     if total_errors == 0:
         print("\n[SUCCESS] All validations passed!")